@@ -1,73 +1,493 @@
 from team import Team
-from teammember import TeamMember
 from dotenv import load_dotenv
+from datetime import date, timedelta
+from functools import cache
+import hashlib
+import json
 import os
-import yaml
+import pickle
+import sys
 from pathlib import Path
 
+# orjson parses the teams JSON sidecar faster when it is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-# Load variables from .env (if present). Does not override existing environment.
-load_dotenv(override=False)
+# fastjsonschema generates a Python validator for the team schema; without it
+# only the set of config keys is checked
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+_dotenv_loaded = False
 
 # Helper to require environment variables
-def _require_env(name: str) -> str:
-    val = os.getenv(name)
+def _require_env(name: str, _env=os.environ) -> str:
+    global _dotenv_loaded
+    if not _dotenv_loaded:
+        # Load variables from .env (if present). Does not override existing environment.
+        # Skip the dotenv search entirely when there is no .env or it is disabled.
+        dotenv_file = Path(__file__).parent / ".env"
+        if os.environ.get("DOTENV_DISABLE") != "1" and dotenv_file.is_file():
+            load_dotenv(dotenv_file, override=False)
+        _dotenv_loaded = True
+    val = _env.get(name)
     if not val:
         raise RuntimeError(f"Missing required environment variable: {name}")
     return val
 
-# API keys now sourced from environment variables (see .env.example / README)
-bamboo_hr_api_key = _require_env("BAMBOO_HR_API_KEY")
-pagerduty_api_key = _require_env("PAGERDUTY_API_KEY")
-jira_api_key = _require_env("JIRA_API_KEY")  # Expected format email:token for basic auth use
-slack_api_key = _require_env("SLACK_API_KEY")
+# API keys now sourced from environment variables (see .env.example / README).
+# They are resolved on first access so importing config doesn't need them set.
+_API_KEY_ENV_VARS = {
+    "bamboo_hr_api_key": "BAMBOO_HR_API_KEY",
+    "pagerduty_api_key": "PAGERDUTY_API_KEY",
+    "jira_api_key": "JIRA_API_KEY",  # Expected format email:token for basic auth use
+    "slack_api_key": "SLACK_API_KEY",
+}
+
+
+def __getattr__(name):
+    """Resolve API keys and teams lazily on first access (PEP 562).
+    
+    The value is stored in the module globals on first access, so later
+    lookups don't come back through here.
+    """
+    if name in _API_KEY_ENV_VARS:
+        val = _require_env(_API_KEY_ENV_VARS[name])
+        globals()[name] = val
+        return val
+    if name == "teams":
+        val = load_teams()
+        globals()["teams"] = val
+        return val
+    if name == "teams_by_name":
+        # Teams keyed by lowercased name, for case-insensitive lookups
+        teams_list = globals()["teams"] if "teams" in globals() else __getattr__("teams")
+        val = {t.name.lower(): t for t in teams_list}
+        globals()["teams_by_name"] = val
+        return val
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # application configuration
-social_dates = ["2025-12-11", "2026-03-18", "2026-06-17", "2026-09-16"]
-xmas_rota_dates = ["2025-12-19", "2026-01-05"]
-xmas_rota_exclusions = ["Craig Banach", "Donal Stewart"]
+# Dates are parsed once here; the original strings are kept as *_str
+social_dates_str = ("2025-12-11", "2026-03-18", "2026-06-17", "2026-09-16")
+social_dates = tuple(date.fromisoformat(d) for d in social_dates_str)
+xmas_rota_dates_str = ("2025-12-19", "2026-01-05")
+xmas_rota_dates = tuple(date.fromisoformat(d) for d in xmas_rota_dates_str)
+xmas_rota_exclusions = frozenset({"Craig Banach", "Donal Stewart"})
 number_of_sprints = 8
 number_of_sprints_back = 0
 api_cache_timeout = 900  # seconds
+api_cache_stale_window = 3600  # seconds an expired result is still served while it refreshes
 
 # date and sprint configuration
 date_format = '%Y-%m-%d'
-first_sprint_date = '2025-03-03'
+first_sprint_date_str = '2025-03-03'
+first_sprint_date = date.fromisoformat(first_sprint_date_str)
 first_sprint_number = 73
 level_one_support_id = 'PGNTR7I'
 level_two_support_id = 'PJJERK8'
 
-# Load teams from YAML files
-def load_teams():
-    """Load team configurations from YAML files in the teams directory."""
+
+def _sprint_start(d):
+    """Find the start of the sprint containing the given date.
+    
+    Sprints start on the Mondays of odd-numbered ISO weeks, so the anchor
+    follows the ISO calendar across 53-week years rather than a strict 14-day
+    grid from first_sprint_date.
+    
+    Args:
+        d: Date to find the sprint start for
+        
+    Returns:
+        date: The Monday that starts the sprint containing d
+    """
+    # The Monday after d (a week on if d is itself a Monday)
+    target_date = d + timedelta(days=7 - d.weekday())
+    if target_date.isocalendar()[1] % 2 == 0:
+        return target_date - timedelta(days=14)
+    return target_date - timedelta(days=7)
+
+
+def sprint_window(today=None):
+    """Map each sprint to report on to its start date.
+    
+    The window runs from number_of_sprints_back before the sprint containing
+    today through number_of_sprints after it, at 14-day steps. Sprint numbers
+    count whole fortnights since first_sprint_date.
+    
+    Args:
+        today: Date to centre the window on (defaults to date.today())
+        
+    Returns:
+        dict: Sprint number -> start date, in date order
+    """
+    first = _sprint_start(today or date.today()) - timedelta(days=14 * number_of_sprints_back)
+    starts = (first + timedelta(days=14 * i) for i in range(number_of_sprints + 1))
+    return {first_sprint_number + int((d - first_sprint_date).days / 14): d for d in starts}
+
+
+# Bump whenever Team/TeamMember change shape so stale pickled caches are ignored
+_TEAMS_CACHE_VERSION = 6
+# Name of the JSON sidecar compiled from the YAML files by build_teams_json()
+_TEAMS_JSON = ".teams.json"
+_STRING = {"type": "string"}
+_NUMBER = {"type": "number"}
+_OPTIONAL_STRING = {"type": ["string", "null"]}
+# JSON schema for a single team YAML file. Its properties match Team's keyword
+# arguments; start/leave dates are left untyped as YAML may already load them
+# as dates.
+TEAM_SCHEMA = {
+    "type": "object",
+    "required": ["name", "jira_key", "points_per_epic", "manager", "point_capacity", "load_factor", "engineering_split"],
+    "additionalProperties": False,
+    "properties": {
+        "name": _STRING,
+        "jira_key": _STRING,
+        "points_per_epic": _NUMBER,
+        "manager": _STRING,
+        "point_capacity": _NUMBER,
+        "load_factor": _NUMBER,
+        "engineering_split": _NUMBER,
+        "team_members": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["name"],
+                "additionalProperties": False,
+                "properties": {
+                    "name": _STRING,
+                    "bamboo_name": _STRING,
+                    "pagerduty_name": _STRING,
+                    "start_date": {},
+                    "leave_date": {},
+                    "start_pct": _NUMBER,
+                },
+            },
+        },
+        "people_of_interest": {
+            "type": "array",
+            "items": {
+                "anyOf": [
+                    _STRING,
+                    {
+                        "type": "object",
+                        "required": ["name"],
+                        "additionalProperties": False,
+                        "properties": {"name": _STRING, "bamboo_name": _STRING},
+                    },
+                ],
+            },
+        },
+        "absences_canvas": _OPTIONAL_STRING,
+        "capacity_canvas": _OPTIONAL_STRING,
+        "support_canvas": _OPTIONAL_STRING,
+    },
+}
+# Keys a team config may contain
+_TEAM_CONFIG_KEYS = frozenset(TEAM_SCHEMA["properties"])
+
+
+@cache
+def _team_validator():
+    """Compile the team schema validator on first use (only on a cache miss).
+    
+    Returns:
+        Compiled fastjsonschema validator, or None if fastjsonschema isn't installed
+    """
+    if fastjsonschema is None:
+        return None
+    return fastjsonschema.compile(TEAM_SCHEMA)
+
+
+def _validate_team_config(team_config):
+    """Check a team config against TEAM_SCHEMA.
+    
+    Args:
+        team_config: Team config dict
+        
+    Raises:
+        RuntimeError: If the config is invalid
+    """
+    validate = _team_validator()
+    if validate is not None:
+        try:
+            validate(team_config)
+        except fastjsonschema.JsonSchemaException as e:
+            raise RuntimeError(f"Invalid team config {team_config.get('name')!r}: {e.message}") from e
+    elif not _TEAM_CONFIG_KEYS.issuperset(team_config):
+        unknown = sorted(set(team_config) - _TEAM_CONFIG_KEYS)
+        raise RuntimeError(f"Unknown keys in team config {team_config.get('name')!r}: {unknown}")
+
+
+def _teams_digest(yaml_entries):
+    """Digest the name, mtime and size of each team YAML file.
+    
+    Editing, adding or removing a team file (or bumping _TEAMS_CACHE_VERSION)
+    produces a different digest.
+    
+    Args:
+        yaml_entries: os.DirEntry objects for the team YAML files
+        
+    Returns:
+        Hex digest string
+    """
+    # DirEntry.stat() reuses the data from the directory scan where possible
+    fingerprint = (_TEAMS_CACHE_VERSION, tuple(
+        (e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in yaml_entries
+    ))
+    return hashlib.blake2b(repr(fingerprint).encode(), digest_size=16).hexdigest()
+
+
+def _teams_cache_file(teams_dir, yaml_entries):
+    """Build the path of the pickled teams cache for the current YAML files.
+    
+    Args:
+        teams_dir: Directory containing the team YAML files
+        yaml_entries: os.DirEntry objects for the team YAML files
+        
+    Returns:
+        Path of the cache file for this set of YAML files
+    """
+    return teams_dir / f".teams.{_teams_digest(yaml_entries)}.pkl"
+
+
+def _load_compiled_teams(yaml_entries):
+    """Load teams from the teams_data module generated by tools/compile_teams.py.
+    
+    Args:
+        yaml_entries: os.DirEntry objects for the team YAML files
+        
+    Returns:
+        Tuple of Team objects, or None if the module is missing or was
+        compiled from different YAML files
+    """
+    try:
+        import teams_data
+    except ImportError:
+        return None
+    if getattr(teams_data, "SOURCE_DIGEST", None) != _teams_digest(yaml_entries):
+        return None
+    return tuple(teams_data.TEAMS)
+
+
+def _write_teams_cache(cache_file, teams):
+    """Atomically write the pickled teams cache and remove stale ones.
+    
+    Args:
+        cache_file: Path to write the cache to
+        teams: Tuple of Team objects to cache
+    """
+    try:
+        for stale in cache_file.parent.glob(".teams.*.pkl"):
+            if stale != cache_file:
+                stale.unlink(missing_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(teams, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        # The cache is only an optimisation, so a read-only checkout still works
+        pass
+
+
+def _read_team_file(entry):
+    """Read a team file's bytes with a single unbuffered read where possible.
+    
+    Args:
+        entry: os.DirEntry for the file
+        
+    Returns:
+        File contents as bytes
+    """
+    size = entry.stat().st_size
+    with open(entry.path, 'rb', buffering=0) as f:
+        # Ask for one byte more than expected so a file that grew since the
+        # directory scan is still read in full
+        data = f.read(size + 1)
+        if len(data) > size:
+            data += f.read()
+    return data
+
+
+def _read_yaml_configs(yaml_entries):
+    """Parse the team YAML files into a list of config dicts.
+    
+    Args:
+        yaml_entries: os.DirEntry objects for the team YAML files
+        
+    Returns:
+        List of team config dicts, in file order
+        
+    Raises:
+        RuntimeError: If a file does not hold exactly one YAML document
+    """
+    # PyYAML is only imported when the caches miss, so importing config stays cheap
+    import yaml
+    # Prefer the libyaml-backed loader; fall back to the pure-Python one if PyYAML
+    # was built without libyaml.
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    team_configs = []
+    for entry in yaml_entries:
+        # Empty documents (a leading or trailing "---") are dropped; an empty
+        # file, or one holding several teams, is reported by name
+        documents = [d for d in yaml.load_all(_read_team_file(entry), Loader=loader) if d is not None]
+        if len(documents) != 1:
+            raise RuntimeError(f"Team file {entry.name} must contain exactly one YAML document, found {len(documents)}")
+        team_configs.append(documents[0])
+    return team_configs
+
+
+def _read_json_configs(teams_dir, yaml_entries):
+    """Read team config dicts from the JSON sidecar if it is up to date.
+    
+    The sidecar is only used when it was built from the same set of YAML files
+    and is at least as new as every one of them.
+    
+    Args:
+        teams_dir: Directory containing the team YAML files
+        yaml_entries: os.DirEntry objects for the team YAML files
+        
+    Returns:
+        List of team config dicts, or None if the sidecar is missing or stale
+    """
+    json_file = teams_dir / _TEAMS_JSON
+    try:
+        json_mtime = json_file.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if any(e.stat().st_mtime_ns > json_mtime for e in yaml_entries):
+        return None
+    try:
+        sidecar = _json_loads(json_file.read_bytes())
+    except ValueError:
+        return None
+    if sidecar.get("files") != [e.name for e in yaml_entries]:
+        return None
+    return sidecar["teams"]
+
+
+def _intern_names(team_config):
+    """Intern the manager and POI name strings of a team config in place.
+    
+    The same people appear across teams (managers, POIs), so interning shares
+    the string objects and makes name comparisons identity checks. Team
+    member names are interned by TeamMember itself.
+    
+    Args:
+        team_config: Team config dict
+    """
+    if isinstance(team_config.get("manager"), str):
+        team_config["manager"] = sys.intern(team_config["manager"])
+    people = team_config.get("people_of_interest") or []
+    for i, person in enumerate(people):
+        if isinstance(person, str):
+            people[i] = sys.intern(person)
+            continue
+        for field in ("name", "bamboo_name"):
+            if isinstance(person.get(field), str):
+                person[field] = sys.intern(person[field])
+
+
+def _build_teams(team_configs):
+    """Create Team objects from team config dicts.
+    
+    Args:
+        team_configs: Iterable of team config dicts
+        
+    Returns:
+        Tuple of Team objects
+    """
     teams = []
+    for team_config in team_configs:
+        _validate_team_config(team_config)
+        _intern_names(team_config)
+        # Config keys map one-to-one onto Team's keyword arguments
+        teams.append(Team(**team_config))
+    return tuple(teams)
+
+
+def _scan_teams_dir():
+    """List the team YAML files.
+    
+    Returns:
+        Tuple of (teams_dir, yaml_entries) with entries sorted by file name
+    """
     teams_dir = Path(__file__).parent / "teams"
     
     if not teams_dir.exists():
         raise RuntimeError(f"Teams directory not found: {teams_dir}")
     
-    # Load all .yaml files from the teams directory
-    for yaml_file in sorted(teams_dir.glob("*.yaml")):
-        with open(yaml_file, 'r') as f:
-            team_config = yaml.safe_load(f)
-        
-        # Create Team object from YAML config
-        team = Team(
-            name=team_config['name'],
-            jira_key=team_config['jira_key'],
-            points_per_epic=team_config['points_per_epic'],
-            manager=team_config['manager'],
-            team_members=team_config.get('team_members', []),
-            people_of_interest=team_config.get('people_of_interest', []),
-            point_capacity=team_config['point_capacity'],
-            load_factor=team_config['load_factor'],
-            engineering_split=team_config['engineering_split'],
-            absences_canvas=team_config.get('absences_canvas'),
-            capacity_canvas=team_config.get('capacity_canvas'),
-            support_canvas=team_config.get('support_canvas')
-        )
-        teams.append(team)
+    with os.scandir(teams_dir) as it:
+        yaml_entries = sorted((e for e in it if e.name.endswith(".yaml")), key=lambda e: e.name)
+    return teams_dir, yaml_entries
+
+
+# Load teams from YAML files
+@cache
+def load_teams():
+    """Load team configurations from YAML files in the teams directory.
     
+    The teams come from the first current source of: the teams_data module
+    compiled by tools/compile_teams.py, the JSON sidecar written by
+    build_teams_json(), or the pickle cached from an earlier YAML parse. Each is
+    ignored once any YAML file changes. Failing all three, the YAML is parsed
+    and the result pickled; the build artifacts aren't re-cached as a pickle, so
+    whichever one is present is what gets loaded. The result is also memoised
+    for the life of the process; call clear_teams_cache() to force a reload.
+    """
+    teams_dir, yaml_entries = _scan_teams_dir()
+    teams = _load_compiled_teams(yaml_entries)
+    if teams is not None:
+        return teams
+    team_configs = _read_json_configs(teams_dir, yaml_entries)
+    if team_configs is not None:
+        return _build_teams(team_configs)
+    cache_file = _teams_cache_file(teams_dir, yaml_entries)
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, AttributeError, EOFError):
+        # Missing, corrupt, or pickled from an older Team/TeamMember shape
+        pass
+    teams = _build_teams(_read_yaml_configs(yaml_entries))
+    _write_teams_cache(cache_file, teams)
     return teams
 
-teams = load_teams()
+
+def clear_teams_cache():
+    """Drop the in-process teams memo (e.g. in tests that rewrite team files)."""
+    load_teams.cache_clear()
+    globals().pop("teams", None)
+    globals().pop("teams_by_name", None)
+
+
+def build_teams_json():
+    """Compile the team YAML files into the teams/.teams.json sidecar.
+    
+    The YAML stays the source of truth; the sidecar is a human-readable build
+    artifact that load_teams() can read faster than the YAML.
+    
+    Returns:
+        Path of the written sidecar
+    """
+    teams_dir, yaml_entries = _scan_teams_dir()
+    sidecar = {
+        "files": [e.name for e in yaml_entries],
+        "teams": _read_yaml_configs(yaml_entries),
+    }
+    json_file = teams_dir / _TEAMS_JSON
+    tmp_file = json_file.with_name(f"{json_file.name}.{os.getpid()}.tmp")
+    # default=str covers any unquoted YAML dates
+    tmp_file.write_text(json.dumps(sidecar, indent=2, default=str))
+    os.replace(tmp_file, json_file)
+    return json_file
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_teams_json()}")
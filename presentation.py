@@ -1,11 +1,239 @@
-import csv
+import ast
 import io
-from datetime import datetime, timedelta
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 from config import social_dates
 import holidays as hols
+import numpy as np
+import threading
 
 date_format = '%Y-%m-%d'
 
+# date.fromisoformat is much cheaper than strptime, and the same absence and
+# on-call strings recur across sprints, so parsed dates are memoised
+_parse_date = lru_cache(maxsize=4096)(date.fromisoformat)
+
+# Shared read-only default for dict lookups, so a miss doesn't allocate a new set
+_EMPTY_SET = frozenset()
+
+
+def _as_date(d):
+    """Return d as a date, parsing ISO strings and truncating datetimes."""
+    if isinstance(d, datetime):
+        return d.date()
+    if isinstance(d, date):
+        return d
+    return _parse_date(d)
+
+
+def _promote_absence(a):
+    """Return absence a as a tuple with date start/end, or None if they aren't dates."""
+    try:
+        return (_as_date(a[0]), _as_date(a[1]), *a[2:])
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+@lru_cache(maxsize=8192)
+def _parse_absences_str(absences):
+    """Parse the repr of an absence list, memoised on the raw string.
+    
+    Start and end are promoted to dates here, once per distinct string. Returns a
+    tuple of tuples so the cached value can't be mutated by callers.
+    """
+    try:
+        parsed = ast.literal_eval(absences)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return ()
+    if not isinstance(parsed, (list, tuple)):
+        return ()
+    return tuple(a for a in map(_promote_absence, parsed) if a is not None)
+
+
+def _format_ordinal_range(start, end):
+    """Format a range of day ordinals as "start - end", or a single date."""
+    if start == end:
+        return date.fromordinal(start).isoformat()
+    return f"{date.fromordinal(start).isoformat()} - {date.fromordinal(end).isoformat()}"
+
+
+@lru_cache(maxsize=32)
+def _row_format(col_widths):
+    """Build the format string for a table row with the given column widths."""
+    return "  ".join("{:<%d}" % w for w in col_widths) + "\n"
+
+
+# Calendar cell labels, indexed by the codes render_calendar assigns
+_CALENDAR_LABELS = np.array(["", "L1", "L2", "X"])
+_CALENDAR_LABEL_WIDTHS = np.array([len(label) for label in _CALENDAR_LABELS])
+
+def _weekdays_between(start, end):
+    """List the Monday-Friday dates from start to end inclusive.
+
+    Args:
+        start: First date of the range
+        end: Last date of the range
+
+    Returns:
+        List of weekday dates in order
+    """
+    # Roll a weekend start forward to Monday, then step through weekday slots
+    # counted from that week's Monday: slot n is n // 5 weeks plus n % 5 days in
+    if start.weekday() >= 5:
+        start += timedelta(days=7 - start.weekday())
+    monday = start - timedelta(days=start.weekday())
+    span = (end - monday).days
+    if span < 0:
+        return []
+    stop = span // 7 * 5 + min(span % 7, 4) + 1
+    return [monday + timedelta(days=n // 5 * 7 + n % 5) for n in range(start.weekday(), stop)]
+
+
+def _day_bits(days, start_date, span):
+    """Return a bitmask with bit k set for each date k days after start_date.
+
+    Args:
+        days: Iterable of dates
+        start_date: Date of bit 0
+        span: Number of days covered; dates outside 0..span-1 are ignored
+
+    Returns:
+        Integer bitmask
+    """
+    mask = 0
+    for d in days:
+        k = (d - start_date).days
+        if 0 <= k < span:
+            mask |= 1 << k
+    return mask
+
+
+def _range_bits(first, last, start_date, span):
+    """Return the _day_bits mask of every date from first to last inclusive."""
+    lo = max((first - start_date).days, 0)
+    hi = min((last - start_date).days, span - 1)
+    if lo > hi:
+        return 0
+    return ((1 << (hi - lo + 1)) - 1) << lo
+
+
+def _fill_calendar_codes(codes, day_offsets, masks, code):
+    """Set codes[row, col] = code wherever bit day_offsets[col] of masks[row] is set.
+
+    Args:
+        codes: People x days int8 matrix to update in place
+        day_offsets: Int64 array of each calendar column's day offset from the start
+        masks: Day bitmask per row, as built by _day_bits
+        code: Label code to assign
+    """
+    if not codes.size:
+        return
+    # Masks wider than 63 days don't fit in int64, so fall back to Python ints
+    dtype = np.int64 if day_offsets[-1] < 63 else object
+    hit = (np.array(masks, dtype=dtype)[:, None] >> day_offsets[None, :]) & 1
+    codes[hit.astype(bool)] = code
+
+
+# English weekday abbreviations, indexed by date.weekday(), so calendar headers
+# don't depend on the process locale
+_DOW = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+@lru_cache(maxsize=32)
+def _calendar_people(team):
+    """Return the sorted, de-duplicated names of a team's members, POIs and manager."""
+    return tuple(sorted({*(m.name for m in team.team_members), *team.people_of_interest, team.manager}))
+
+
+@lru_cache(maxsize=32)
+def _calendar_pd_names(team):
+    """Return a mapping of each team member's PagerDuty name to their name."""
+    return {m.pagerduty_name: m.name for m in team.team_members}
+
+
+@lru_cache(maxsize=16)
+def _calendar_header(start_date, end_date):
+    """Build the calendar columns for a date range (memoised).
+
+    Every team rendered for the same range shares the result.
+
+    Args:
+        start_date: Start date for the calendar
+        end_date: End date for the calendar
+
+    Returns:
+        Tuple of (weekday dates, read-only int64 array of their day offsets
+        from start_date, header lines per column, header width per column);
+        the first column is the Name column
+    """
+    date_list = tuple(_weekdays_between(start_date, end_date))
+    day_offsets = np.array([(d - start_date).days for d in date_list], dtype=np.int64)
+    day_offsets.setflags(write=False)
+    header_lines_split = (("Name",),) + tuple(
+        (_DOW[d.weekday()], f"{d.day:02d}/{d.month:02d}") for d in date_list
+    )
+    header_widths = tuple(max(len(line) for line in lines) for lines in header_lines_split)
+    return date_list, day_offsets, header_lines_split, header_widths
+
+
+def _csv_field(value):
+    """Quote a CSV field the way csv.writer's default dialect would."""
+    value = str(value)
+    if any(c in value for c in ',"\r\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _today_iso():
+    """Today's date as an ISO string, for comparing against ISO date strings."""
+    return date.today().isoformat()
+
+
+# One long-lived holidays instance per region. They start empty and the holidays
+# library fills in each year the first time a date in it is looked up.
+_gb_instances = {division: hols.GB(subdiv=division) for division in ('ENG', 'SCT', 'WLS', 'NIR')}
+_ie_instance = hols.IE()
+# Populating a year mutates the instance, and renderers may run concurrently
+_holidays_lock = threading.Lock()
+
+
+def _sorted_holidays(instance, years):
+    """Populate years in a shared holidays instance and return its sorted (date, name) items."""
+    with _holidays_lock:
+        for year in years:
+            # Membership tests populate the year on first use
+            date(year, 1, 1) in instance
+        return tuple(sorted(instance.items()))
+
+
+@lru_cache(maxsize=64)
+def _gb_holidays(division, years):
+    """Sorted (date, name) UK public holidays for a division, covering at least years."""
+    return _sorted_holidays(_gb_instances[division], years)
+
+
+@lru_cache(maxsize=64)
+def _ie_holidays(years):
+    """Sorted (date, name) Irish public holidays, covering at least years."""
+    return _sorted_holidays(_ie_instance, years)
+
+
+@lru_cache(maxsize=8)
+def _bank_holiday_regions(years):
+    """(region, sorted holiday items) for each region in the sprint report, in report order."""
+    regions = [(division, _gb_holidays(division, years)) for division in ('SCT', 'ENG', 'NIR', 'WLS')]
+    regions.append(('IE', _ie_holidays(years)))
+    return tuple(regions)
+
+
+def _holidays_between(holiday_items, start, end):
+    """Slice sorted (date, name) holiday items to those between start and end inclusive."""
+    lo = bisect_left(holiday_items, start, key=itemgetter(0))
+    hi = bisect_right(holiday_items, end, key=itemgetter(0), lo=lo)
+    return dict(holiday_items[lo:hi])
+
 
 class SprintPresentation:
     """Renders sprint planning data in various formats for display and export."""
@@ -21,31 +249,27 @@ class SprintPresentation:
             String with warnings or "No L1/L2 absence warnings."
         """
         warnings = []
-        for sprint in data['sprints']:
+        absence_index = SprintPresentation._index_absences(data)
+        for sprint, sprint_absences in zip(data['sprints'], absence_index):
             l1 = sprint.get('l1', {})
             l2 = sprint.get('l2', {})
-            holidays = sprint.get('holidays', [])
-            absences_map = {}
-            for row in holidays:
-                name = row[0]
-                absences = SprintPresentation.safe_eval_absences(row[2]) if len(row) > 2 else []
-                for a in absences:
-                    start = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                    end = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
-                    start_dt = datetime.strptime(start, '%Y-%m-%d').date()
-                    end_dt = datetime.strptime(end, '%Y-%m-%d').date()
-                    for n in range((end_dt - start_dt).days + 1):
-                        absences_map.setdefault(name, set()).add(start_dt + timedelta(days=n))
-            for name, l1_dates in l1.items():
-                for d in l1_dates:
-                    d_dt = datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d
-                    if name in absences_map and d_dt in absences_map[name]:
-                        warnings.append(f"WARNING: {name} is absent on {d_dt} but scheduled for L1 shift.")
-            for name, l2_dates in l2.items():
-                for d in l2_dates:
-                    d_dt = datetime.strptime(d, '%Y-%m-%d').date() if isinstance(d, str) else d
-                    if name in absences_map and d_dt in absences_map[name]:
-                        warnings.append(f"WARNING: {name} is absent on {d_dt} but scheduled for L2 shift.")
+            intervals_map = {}
+            for name, start_dt, end_dt in sprint_absences:
+                intervals_map.setdefault(name, []).append((start_dt, end_dt))
+            for label, assignments in (("L1", l1), ("L2", l2)):
+                for name, dates in assignments.items():
+                    intervals = intervals_map.get(name)
+                    if not intervals or not dates:
+                        continue
+                    # Work in day ordinals: expand the absences only across the span of
+                    # this person's on-call days, then intersect the two sets
+                    on_call = {(_parse_date(d) if isinstance(d, str) else d).toordinal() for d in dates}
+                    first, last = min(on_call), max(on_call)
+                    absent = set()
+                    for start_dt, end_dt in intervals:
+                        absent.update(range(max(start_dt.toordinal(), first), min(end_dt.toordinal(), last) + 1))
+                    for o in sorted(on_call & absent):
+                        warnings.append(f"WARNING: {name} is absent on {date.fromordinal(o)} but scheduled for {label} shift.")
         return '\n'.join(warnings) if warnings else "No L1/L2 absence warnings."
     
     
@@ -61,19 +285,14 @@ class SprintPresentation:
             CSV formatted string
         """
         header = ["Name"] + [d.strftime("%A %Y-%m-%d") for d in date_list]
-        rows = []
-        for display_name, absence_dates in user_absence_map.items():
-            row = [display_name]
-            for d in date_list:
-                row.append("1" if d in absence_dates else "")
-            rows.append(row)
-        rows.sort(key=lambda x: x[0])
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow(header)
-        for row in rows:
-            writer.writerow(row)
-        return output.getvalue()
+        lines = [",".join(header)]
+        for display_name, absence_dates in sorted(user_absence_map.items(), key=lambda x: x[0]):
+            if not isinstance(absence_dates, (set, frozenset)):
+                absence_dates = frozenset(absence_dates)
+            # Only the name can need quoting; the other cells are "1" or ""
+            lines.append(",".join([_csv_field(display_name)] + ["1" if d in absence_dates else "" for d in date_list]))
+        # Same "\r\n" line endings csv.writer produces
+        return "\r\n".join(lines) + "\r\n"
     
     
     @staticmethod
@@ -86,10 +305,26 @@ class SprintPresentation:
         Returns:
             Filtered list of dates >= today
         """
-        today = datetime.now().strftime(date_format)
+        today = _today_iso()
         return [d for d in dates if d >= today]
 
 
+    @staticmethod
+    def filter_future_dates_sorted(dates, today_str=None):
+        """Filter a sorted list of dates to only include future dates.
+        
+        Args:
+            dates: Sorted list of date strings
+            today_str: Today's date string, if already known
+            
+        Returns:
+            Slice of dates >= today
+        """
+        if today_str is None:
+            today_str = _today_iso()
+        return dates[bisect_left(dates, today_str):]
+
+
     @staticmethod
     def filter_future_holiday_ranges(ranges):
         """Filter list of date ranges to only include those ending in the future.
@@ -100,7 +335,7 @@ class SprintPresentation:
         Returns:
             Filtered list of ranges where end >= today
         """
-        today = datetime.now().strftime(date_format)
+        today = _today_iso()
         return [(start, end) for start, end in ranges if end >= today]
 
 
@@ -116,12 +351,16 @@ class SprintPresentation:
             Dictionary mapping names to sets of assignment dates
         """
         assignments = {}
+        today = _today_iso()
         for sprint in data['sprints']:
             for name, dates in sprint[key].items():
-                if name not in assignments:
-                    assignments[name] = set()
-                for d in SprintPresentation.filter_future_dates(dates):
-                    assignments[name].add(d)
+                name_dates = assignments.setdefault(name, set())
+                # On-call dates come from PagerDuty's rendered schedule, which is in date
+                # order, so only lists that start in the past need cutting
+                if dates and dates[0] < today:
+                    name_dates.update(SprintPresentation.filter_future_dates_sorted(dates, today))
+                else:
+                    name_dates.update(dates)
         return assignments
 
 
@@ -138,50 +377,92 @@ class SprintPresentation:
         Returns:
             Formatted table string
         """
+        buf = io.StringIO()
+        SprintPresentation._write_sorted_table(buf, rows, headers, label, sort_by)
+        return buf.getvalue()
+
+
+    @staticmethod
+    def _write_sorted_table(buf, rows, headers=None, label=None, sort_by=0):
+        """Write the output of sort_and_render_table to the text stream buf."""
         if sort_by:
             rows.sort(key=lambda row: row[sort_by])
-        output = ""
         if not rows:
             if label:
-                output += f"  None ({label})\n"
+                buf.write(f"  None ({label})\n")
             else:
-                output += "  None\n"
-            return output
+                buf.write("  None\n")
+            return
         if label:
-            output += f"{label}\n"
-        output += SprintPresentation.build_aligned_table(rows, headers=headers)
-        return output
+            buf.write(f"{label}\n")
+        SprintPresentation._write_aligned_table(buf, rows, headers=headers)
 
 
     @staticmethod
     def safe_eval_absences(absences):
         """Safely parse absence data which may be in various formats.
         
-        Handles string representations, lists of tuples, or pre-formatted data.
+        Handles string representations or lists of tuples. Whatever the input,
+        each returned absence starts with its start and end as date objects;
+        entries whose start or end isn't a date are dropped.
         
         Args:
             absences: Absence data in various formats
             
         Returns:
-            List of absence tuples or empty list
+            Sequence of absence tuples or empty list
         """
-        # If absences is a string, try to eval, else return as is
+        # If absences is a string, parse it as a literal
         if isinstance(absences, str):
-            try:
-                return eval(absences)
-            except Exception:
-                return []
-        if isinstance(absences, (list, tuple)):
-            # If it's a list of tuples, return as is
-            if absences and isinstance(absences[0], (tuple, list)):
-                return absences
-            # If it's a list of date ranges as strings, wrap in a list
-            if absences and isinstance(absences[0], str):
-                return absences
+            return _parse_absences_str(absences)
+        # If it's a list of tuples, promote the start and end of each
+        if isinstance(absences, (list, tuple)) and absences and isinstance(absences[0], (tuple, list)):
+            return tuple(a for a in map(_promote_absence, absences) if a is not None)
         # If it's already a formatted string, return empty list
         return []
 
 
+    @staticmethod
+    def _index_absences(data, key='holidays'):
+        """Parse the absences under key in every sprint, once per data dict.
+        
+        The renderers all walk the same holiday rows, so the parsed form is kept
+        in data['_absence_index'] and shared between them.
+        
+        Args:
+            data: Sprint data dictionary
+            key: 'holidays' or 'poi_manager_holidays'
+            
+        Returns:
+            List with one entry per sprint, each a list of (name, start, end) date tuples
+        """
+        absence_index = data.setdefault('_absence_index', {})
+        if key not in absence_index:
+            absence_index[key] = [
+                [
+                    (row[0], a[0], a[1])
+                    for row in sprint.get(key, []) if len(row) > 2
+                    for a in SprintPresentation.safe_eval_absences(row[2])
+                ]
+                for sprint in data['sprints']
+            ]
+        return absence_index[key]
+
+
+    @staticmethod
+    def build_absence_indexes(data):
+        """Build the shared absence indexes up front.
+        
+        _index_absences adds data['_absence_index'] on first use, so call this
+        before rendering from several threads, or while other code iterates data.
+        
+        Args:
+            data: Sprint data dictionary
+        """
+        for key in ('holidays', 'poi_manager_holidays'):
+            SprintPresentation._index_absences(data, key)
+
+
     @staticmethod
     def filter_future_absence_ranges(absence_ranges):
         """Filter absence ranges to only include those ending in the future.
@@ -192,7 +473,7 @@ class SprintPresentation:
         Returns:
             Filtered list of ranges where end >= today
         """
-        today = datetime.now().strftime(date_format)
+        today = _today_iso()
         return [(start, end) for start, end in absence_ranges if str(end) >= today]
 
 
@@ -203,34 +484,30 @@ class SprintPresentation:
         Consecutive dates are collapsed into ranges (e.g., "2025-01-01 - 2025-01-03").
         
         Args:
-            dates: Sorted list of date strings or datetime.date objects
+            dates: Collection of date strings or datetime.date objects, in any order
             
         Returns:
             Comma-separated string of dates and date ranges
         """
-        # Accepts a sorted list of date strings or datetime.date objects
+        # Accepts any collection (list, set, tuple) of date strings or datetime.date
+        # objects; the ordinals are sorted here, so callers needn't sort first
         if not dates:
             return ""
-        # Convert to date objects if needed
-        if isinstance(dates[0], str):
-            dates = [datetime.strptime(d, "%Y-%m-%d").date() for d in dates]
-        dates.sort()
+        # Work on day ordinals so consecutive days are a plain integer step
+        if isinstance(next(iter(dates)), str):
+            ordinals = sorted(_parse_date(d).toordinal() for d in dates)
+        else:
+            ordinals = sorted(d.toordinal() for d in dates)
         ranges = []
-        start = end = dates[0]
-        for d in dates[1:]:
-            if (d - end).days == 1:
-                end = d
+        start = end = ordinals[0]
+        for o in ordinals[1:]:
+            if o == end + 1:
+                end = o
             else:
-                if start == end:
-                    ranges.append(start.strftime('%Y-%m-%d'))
-                else:
-                    ranges.append(f"{start.strftime('%Y-%m-%d')} - {end.strftime('%Y-%m-%d')}")
-                start = end = d
+                ranges.append(_format_ordinal_range(start, end))
+                start = end = o
         # Add last range
-        if start == end:
-            ranges.append(start.strftime('%Y-%m-%d'))
-        else:
-            ranges.append(f"{start.strftime('%Y-%m-%d')} - {end.strftime('%Y-%m-%d')}")
+        ranges.append(_format_ordinal_range(start, end))
         return ", ".join(ranges)
 
 
@@ -244,18 +521,10 @@ class SprintPresentation:
         Returns:
             Comma-separated string of formatted date ranges
         """
-        # absences: list of tuples (start, end, ...), but may contain strings
         formatted = []
-        for a in absences:
-            # Handle if a[0] or a[1] is a string
-            if isinstance(a[0], str):
-                start_str = a[0]
-            else:
-                start_str = a[0].strftime('%Y-%m-%d')
-            if isinstance(a[1], str):
-                end_str = a[1]
-            else:
-                end_str = a[1].strftime('%Y-%m-%d')
+        for a in SprintPresentation.safe_eval_absences(absences):
+            start_str = a[0].isoformat()
+            end_str = a[1].isoformat()
             if start_str == end_str:
                 formatted.append(start_str)
             else:
@@ -282,11 +551,10 @@ class SprintPresentation:
                 absences = SprintPresentation.safe_eval_absences(row[2])
                 for a in absences:
                     # Format each absence as a single row, skip if already ended
-                    end_date = a[1] if not isinstance(a[1], str) else datetime.strptime(a[1], "%Y-%m-%d").date()
-                    if end_date < today:
+                    if a[1] < today:
                         continue
-                    start_str = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                    end_str = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
+                    start_str = a[0].isoformat()
+                    end_str = a[1].isoformat()
                     if start_str == end_str:
                         formatted = start_str
                     else:
@@ -307,11 +575,8 @@ class SprintPresentation:
         Returns:
             Tuple of (public_holidays dict, formatted output string)
         """
-        public_holidays = {}
+        public_holidays = _holidays_between(_gb_holidays(division, (start.year, start.year + 1)), start.date(), end.date())
         output = ""
-        for date, name in sorted(hols.GB(subdiv=division, years=[start.year,start.year + 1]).items()):
-            if date >= start.date() and date <= end.date():
-                public_holidays[date] = name
         if not public_holidays:
             output += f"None ({division})\n"
         else:
@@ -331,11 +596,8 @@ class SprintPresentation:
         Returns:
             Tuple of (public_holidays dict, formatted output string)
         """
-        public_holidays = {}
+        public_holidays = _holidays_between(_ie_holidays((start.year, start.year + 1)), start.date(), end.date())
         output = ""
-        for date, name in sorted(hols.IE(years=[start.year,start.year + 1]).items()):
-            if date >= start.date() and date <= end.date():
-                public_holidays[date] = name
         if not public_holidays:
             output += "None (IE)\n"
         else:
@@ -355,20 +617,38 @@ class SprintPresentation:
         Returns:
             Formatted table string with aligned columns
         """
+        buf = io.StringIO()
+        SprintPresentation._write_aligned_table(buf, rows, headers)
+        return buf.getvalue()
+
+
+    @staticmethod
+    def _write_aligned_table(buf, rows, headers=None):
+        """Write the output of build_aligned_table to the text stream buf."""
         if not rows:
-            return ""
-        output = ""
+            return
+        # Columns beyond the shortest row (or the headers) are dropped
+        num_cols = min(len(row) for row in rows)
         if headers:
-            col_widths = [max(len(str(h)), max(len(str(item)) for item in col)) for h, col in zip(headers, zip(*rows))]
+            num_cols = min(num_cols, len(headers))
+            col_widths = [len(str(h)) for h in headers[:num_cols]]
         else:
-            col_widths = [max(len(str(item)) for item in col) for col in zip(*rows)]
-        if headers:
-            header_row = "  ".join(f"{h:<{w}}" for h, w in zip(headers, col_widths))
-            output += header_row + "\n"
-            output += "  ".join("-" * w for w in col_widths) + "\n"
+            col_widths = [0] * num_cols
+        # Stringify each cell once, tracking the column widths in the same pass
+        str_rows = []
         for row in rows:
-            output += "  ".join(f"{str(item):<{w}}" for item, w in zip(row, col_widths)) + "\n"
-        return output
+            str_row = [item if type(item) is str else str(item) for item in row[:num_cols]]
+            for i, item in enumerate(str_row):
+                if len(item) > col_widths[i]:
+                    col_widths[i] = len(item)
+            str_rows.append(str_row)
+        # One format string for every row, shared by tables with the same widths
+        row_format = _row_format(tuple(col_widths))
+        if headers:
+            buf.write(row_format.format(*headers[:num_cols]))
+            buf.write("  ".join("-" * w for w in col_widths) + "\n")
+        for str_row in str_rows:
+            buf.write(row_format.format(*str_row))
 
 
     @staticmethod
@@ -381,32 +661,39 @@ class SprintPresentation:
         Returns:
             Formatted availability summary string
         """
-        output = "\nTeam Availability:\n"
+        buf = io.StringIO()
+        SprintPresentation._write_team_availability(buf, data)
+        return buf.getvalue()
+
+
+    @staticmethod
+    def _write_team_availability(buf, data):
+        """Write the output of render_team_availability to the text stream buf."""
+        buf.write("\nTeam Availability:\n")
         # Format holidays, L1, L2 columns with ranges
         formatted_rows = []
         for row in data["rows"]:
             name, days, holidays, l1, l2 = row
-            holidays_str = SprintPresentation.format_date_ranges(sorted(holidays)) if isinstance(holidays, (list, set)) and holidays else str(holidays)
-            l1_str = SprintPresentation.format_date_ranges(sorted(l1)) if isinstance(l1, (list, set)) and l1 else str(l1)
-            l2_str = SprintPresentation.format_date_ranges(sorted(l2)) if isinstance(l2, (list, set)) and l2 else str(l2)
+            holidays_str = SprintPresentation.format_date_ranges(holidays) if isinstance(holidays, (list, set)) and holidays else str(holidays)
+            l1_str = SprintPresentation.format_date_ranges(l1) if isinstance(l1, (list, set)) and l1 else str(l1)
+            l2_str = SprintPresentation.format_date_ranges(l2) if isinstance(l2, (list, set)) and l2 else str(l2)
             formatted_rows.append([name, days, holidays_str, l1_str, l2_str])
-        output += SprintPresentation.sort_and_render_table(formatted_rows, headers=["Name", "Days", "Holidays", "L1", "L2"])
-        output += f"Total available days: {data['total_team_days']}\n\n"
-        output += f"Scheduled Epics:  {data['sprint_epic_total']:.1f} ({data['sprint_epic_total'] * data['team'].points_per_epic:.1f} points)\n"
-        output += f"Estimated point capacity: {data['points']:.1f}\n"
-        output += f"  ENG:  {data['eng_points']:.1f}\n"
-        output += f"  PROD: {data['prod_points']:.1f}\n"
+        SprintPresentation._write_sorted_table(buf, formatted_rows, headers=["Name", "Days", "Holidays", "L1", "L2"])
+        buf.write(f"Total available days: {data['total_team_days']}\n\n")
+        buf.write(f"Scheduled Epics:  {data['sprint_epic_total']:.1f} ({data['sprint_epic_total'] * data['team'].points_per_epic:.1f} points)\n")
+        buf.write(f"Estimated point capacity: {data['points']:.1f}\n")
+        buf.write(f"  ENG:  {data['eng_points']:.1f}\n")
+        buf.write(f"  PROD: {data['prod_points']:.1f}\n")
         if data['sprint_epic_total'] * data['team'].points_per_epic > data['points']:
-            output += f"  WARNING: Scheduled epics exceed available point capacity\n"
+            buf.write(f"  WARNING: Scheduled epics exceed available point capacity\n")
         for name, date_str in data['starters_this_sprint']:
-            output += f"NOTE: {name} joins the team on {date_str}.\n"
+            buf.write(f"NOTE: {name} joins the team on {date_str}.\n")
         for name, date_str in data['leavers_this_sprint']:
-            output += f"NOTE: {name} is leaving the team on {date_str}.\n"
+            buf.write(f"NOTE: {name} is leaving the team on {date_str}.\n")
         if data['ramping_this_sprint']:
-            output += "Ramping up this sprint:\n"
+            buf.write("Ramping up this sprint:\n")
             for name, pct in data['ramping_this_sprint']:
-                output += f"  {name} (ramp multiplier: {pct}%)\n"
-        return output
+                buf.write(f"  {name} (ramp multiplier: {pct}%)\n")
 
 
     @staticmethod
@@ -419,66 +706,60 @@ class SprintPresentation:
         Returns:
             Formatted full sprint report string
         """
-        output = f"Team: {data['team'].name} | Manager: {data['team'].manager} | Team ({len(data['core_display_names'])}): {data['core_display_names']}\n"
-        for sprint in data['sprints']:
-            output += f"\nSprint {sprint['sprint_number']}: {sprint['start']} to {sprint['end']}\n"
+        buf = io.StringIO()
+        buf.write(f"Team: {data['team'].name} | Manager: {data['team'].manager} | Team ({len(data['core_display_names'])}): {data['core_display_names']}\n")
+        holiday_index = SprintPresentation._index_absences(data)
+        poi_index = SprintPresentation._index_absences(data, 'poi_manager_holidays')
+        for sprint_idx, sprint in enumerate(data['sprints']):
+            buf.write(f"\nSprint {sprint['sprint_number']}: {sprint['start']} to {sprint['end']}\n")
             if sprint['social']:
-                output += f"This sprint includes a company social on {sprint['social']} (availability reduced by 1 day for all team members)\n"
-            output += "Holidays:\n"
+                buf.write(f"This sprint includes a company social on {sprint['social']} (availability reduced by 1 day for all team members)\n")
+            buf.write("Holidays:\n")
             holiday_rows = []
-            for row in sprint.get('holidays', []):
-                name = row[0]
-                absences = SprintPresentation.safe_eval_absences(row[2])
-                for a in absences:
-                    start_str = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                    end_str = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
-                    formatted = start_str if start_str == end_str else f"{start_str} - {end_str}"
-                    holiday_rows.append((name, formatted))
-            holiday_rows = [list(t) for t in sorted(set(holiday_rows))]
-            output += SprintPresentation.sort_and_render_table(holiday_rows, headers=["Name", "Holiday"])
-            output += "\nManager/POI Holidays:\n"
+            seen = set()
+            for name, start_dt, end_dt in holiday_index[sprint_idx]:
+                formatted = start_dt.isoformat() if start_dt == end_dt else f"{start_dt.isoformat()} - {end_dt.isoformat()}"
+                if (name, formatted) not in seen:
+                    seen.add((name, formatted))
+                    holiday_rows.append([name, formatted])
+            holiday_rows.sort()
+            SprintPresentation._write_sorted_table(buf, holiday_rows, headers=["Name", "Holiday"])
+            buf.write("\nManager/POI Holidays:\n")
             poi_rows = []
-            for row in sprint.get('poi_manager_holidays', []):
-                name = row[0]
-                absences = SprintPresentation.safe_eval_absences(row[2])
-                for a in absences:
-                    start_str = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                    end_str = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
-                    formatted = start_str if start_str == end_str else f"{start_str} - {end_str}"
-                    poi_rows.append((name, formatted))
-            poi_rows = [list(t) for t in sorted(set(poi_rows))]
-            output += SprintPresentation.sort_and_render_table(poi_rows, headers=["Name", "Holiday"])
-            output += '\nBank Holidays:\n'
-            for division in ['SCT', 'ENG', 'NIR', 'WLS']:
-                bh, bh_output = SprintPresentation.list_gb_public_holidays(division, datetime.strptime(sprint['start'], date_format), datetime.strptime(sprint['end'], date_format))
+            seen = set()
+            for name, start_dt, end_dt in poi_index[sprint_idx]:
+                formatted = start_dt.isoformat() if start_dt == end_dt else f"{start_dt.isoformat()} - {end_dt.isoformat()}"
+                if (name, formatted) not in seen:
+                    seen.add((name, formatted))
+                    poi_rows.append([name, formatted])
+            poi_rows.sort()
+            SprintPresentation._write_sorted_table(buf, poi_rows, headers=["Name", "Holiday"])
+            buf.write('\nBank Holidays:\n')
+            sprint_start_dt = _parse_date(sprint['start'])
+            sprint_end_dt = _parse_date(sprint['end'])
+            for region, holiday_items in _bank_holiday_regions((sprint_start_dt.year, sprint_start_dt.year + 1)):
+                bh = _holidays_between(holiday_items, sprint_start_dt, sprint_end_dt)
                 if bh:
-                    formatted_bh = SprintPresentation.format_date_ranges(sorted(bh.keys()))
-                    output += f"{division} Bank Holidays: {formatted_bh}\n"
+                    buf.write(f"{region} Bank Holidays: {SprintPresentation.format_date_ranges(bh)}\n")
                 else:
-                    output += bh_output
-            ie_bh, ie_output = SprintPresentation.list_ie_public_holidays(datetime.strptime(sprint['start'], date_format), datetime.strptime(sprint['end'], date_format))
-            if ie_bh:
-                formatted_ie_bh = SprintPresentation.format_date_ranges(sorted(ie_bh.keys()))
-                output += f"IE Bank Holidays: {formatted_ie_bh}\n"
-            else:
-                output += ie_output
-            output += "\nOn Call:\n"
-            output += "L1:\n"
+                    buf.write(f"None ({region})\n")
+            buf.write("\nOn Call:\n")
+            buf.write("L1:\n")
             l1 = sprint['l1']
             l1_rows = []
             for name, dates in l1.items():
-                formatted_dates = SprintPresentation.format_date_ranges(sorted(dates))
+                formatted_dates = SprintPresentation.format_date_ranges(dates)
                 l1_rows.append([str(name), len(dates), formatted_dates])
-            output += SprintPresentation.sort_and_render_table(l1_rows, headers=["Name", "Days", "Dates"])
-            output += "L2:\n"
+            SprintPresentation._write_sorted_table(buf, l1_rows, headers=["Name", "Days", "Dates"])
+            buf.write("L2:\n")
             l2 = sprint['l2']
             l2_rows = []
             for name, dates in l2.items():
-                formatted_dates = SprintPresentation.format_date_ranges(sorted(dates))
+                formatted_dates = SprintPresentation.format_date_ranges(dates)
                 l2_rows.append([str(name), len(dates), formatted_dates])
-            output += SprintPresentation.sort_and_render_table(l2_rows, headers=["Name", "Days", "Dates"])
-            output += SprintPresentation.render_team_availability(sprint['team_availability'])
-        return output
+            SprintPresentation._write_sorted_table(buf, l2_rows, headers=["Name", "Days", "Dates"])
+            SprintPresentation._write_team_availability(buf, sprint['team_availability'])
+        return buf.getvalue()
 
 
     @staticmethod
@@ -492,6 +773,10 @@ class SprintPresentation:
             Formatted capacity table string
         """
         rows = []
+        def norm(s):
+            return str(s).strip().lower()
+        # Normalised PagerDuty name per member, built once rather than per sprint
+        name_to_pd = {m.name: norm(m.pagerduty_name) for m in data['team'].team_members}
         for sprint in data['sprints']:
             sprint_number = sprint['sprint_number']
             sprint_start = sprint['start']
@@ -501,15 +786,13 @@ class SprintPresentation:
             point_capacity = sprint['team_availability']['points']
             total_working_days = sprint['team_availability']['total_team_days']
             active_names = set(row[0].replace(" *", "") for row in sprint['team_availability']['rows'] if row[1] != "0")
-            def norm(s):
-                return str(s).strip().lower()
-            active_pd_names = set(norm(m.pagerduty_name) for m in data['team'].team_members if m.name in active_names)
+            active_pd_names = {name_to_pd[n] for n in active_names if n in name_to_pd}
             total_holidays = sprint['team_availability']['total_team_holidays']
             total_l1_days = sum(len(days) for name, days in sprint['l1'].items() if norm(name) in active_pd_names)
             diff_pct = 100.0 * (scheduled_points - point_capacity) / point_capacity if point_capacity > 0 else 0.0
-            sprint_start_dt = datetime.strptime(sprint_start, '%Y-%m-%d').date()
+            sprint_start_dt = _parse_date(sprint_start)
             sprint_end_dt = sprint_start_dt + timedelta(days=13)
-            has_social = any(social_date for social_date in social_dates if sprint_start_dt <= datetime.strptime(social_date, '%Y-%m-%d').date() <= sprint_end_dt)
+            has_social = any(social_date for social_date in social_dates if sprint_start_dt <= social_date <= sprint_end_dt)
             warning = ''
             if scheduled_points > point_capacity:
                 warning += '+'
@@ -550,16 +833,18 @@ class SprintPresentation:
             Formatted simplified capacity table string
         """
         rows = []
+        def norm(s):
+            return str(s).strip().lower()
+        # Normalised PagerDuty name per member, built once rather than per sprint
+        name_to_pd = {m.name: norm(m.pagerduty_name) for m in data['team'].team_members}
         for sprint in data['sprints']:
             sprint_number = sprint['sprint_number']
             sprint_start = sprint['start']
             point_capacity = sprint['team_availability']['points']
             total_holidays = sprint['team_availability']['total_team_holidays']
             # L1: sum of days for active members
-            def norm(s):
-                return str(s).strip().lower()
             active_names = set(row[0].replace(" *", "") for row in sprint['team_availability']['rows'] if row[1] != "0")
-            active_pd_names = set(norm(m.pagerduty_name) for m in data['team'].team_members if m.name in active_names)
+            active_pd_names = {name_to_pd[n] for n in active_names if n in name_to_pd}
             total_l1_days = sum(len(days) for name, days in sprint['l1'].items() if norm(name) in active_pd_names)
             rows.append([
                 sprint_number,
@@ -633,17 +918,15 @@ class SprintPresentation:
             Formatted holiday table string
         """
         rows = []
-        for sprint in data['sprints']:
-            for row in sprint.get(key, []):
-                name = row[0]
-                absences = SprintPresentation.safe_eval_absences(row[2])
-                for a in absences:
-                    start_str = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                    end_str = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
-                    formatted = start_str if start_str == end_str else f"{start_str} - {end_str}"
+        seen = set()
+        for sprint_absences in SprintPresentation._index_absences(data, key):
+            for name, start_dt, end_dt in sprint_absences:
+                formatted = start_dt.isoformat() if start_dt == end_dt else f"{start_dt.isoformat()} - {end_dt.isoformat()}"
+                # Deduplicate as rows are built; absences span sprints
+                if (name, formatted) not in seen:
+                    seen.add((name, formatted))
                     rows.append([name, formatted])
-        # Deduplicate and sort
-        rows = [list(t) for t in sorted(set(tuple(row) for row in rows))]
+        rows.sort()
         table = SprintPresentation.sort_and_render_table(rows, ["Name", "Holiday"])
         return table
 
@@ -662,7 +945,7 @@ class SprintPresentation:
         rows = []
         for name, dates in l1_assignments.items():
             if dates:
-                formatted_dates = SprintPresentation.format_date_ranges(sorted(dates))
+                formatted_dates = SprintPresentation.format_date_ranges(dates)
                 rows.append([str(name), len(dates), formatted_dates])
         return SprintPresentation.sort_and_render_table(rows, headers=["Name", "Days", "Dates"])
 
@@ -710,33 +993,31 @@ class SprintPresentation:
         are combined into a comma-separated list. If different names occur on the same
         date (unlikely but guarded), each distinct name gets its own row.
         """
-        start = datetime.now()
+        # The table only changes from one day to the next, so it is cached per day
+        return SprintPresentation._render_bank_holidays_from(_today_iso())
+
+
+    @staticmethod
+    @lru_cache(maxsize=4)
+    def _render_bank_holidays_from(today_iso):
+        """Render the 12-month bank holiday table starting from today_iso (memoised)."""
+        start = datetime.fromisoformat(today_iso)
         end = start + timedelta(days=365)
-        # Collect per date: name -> set(regions)
-        by_date = {}
-        gb_divisions = ['ENG', 'SCT', 'WLS', 'NIR']
-        for division in gb_divisions:
-            hols_dict, _ = SprintPresentation.list_gb_public_holidays(division, start, end)
+        # Collect per (date, name): the regions observing it. Regions are visited in
+        # alphabetical order, so each region list is built already sorted.
+        regions_by_holiday = {}
+        for region in ['ENG', 'IE', 'NIR', 'SCT', 'WLS']:
+            if region == 'IE':
+                hols_dict, _ = SprintPresentation.list_ie_public_holidays(start, end)
+            else:
+                hols_dict, _ = SprintPresentation.list_gb_public_holidays(region, start, end)
             for date_obj, name in hols_dict.items():
-                date_str = date_obj.strftime('%Y-%m-%d')
-                if date_str not in by_date:
-                    by_date[date_str] = {}
-                if name not in by_date[date_str]:
-                    by_date[date_str][name] = set()
-                by_date[date_str][name].add(division)
-        ie_hols_dict, _ = SprintPresentation.list_ie_public_holidays(start, end)
-        for date_obj, name in ie_hols_dict.items():
-            date_str = date_obj.strftime('%Y-%m-%d')
-            if date_str not in by_date:
-                by_date[date_str] = {}
-            if name not in by_date[date_str]:
-                by_date[date_str][name] = set()
-            by_date[date_str][name].add('IE')
-        rows = []
-        for date_str in sorted(by_date.keys()):
-            for name, regions in sorted(by_date[date_str].items()):
-                region_list = ", ".join(sorted(regions))
-                rows.append([date_str, name, region_list])
+                regions_by_holiday.setdefault((date_obj.isoformat(), name), []).append(region)
+        # Sorting the (date, name) keys orders rows by date, then by name
+        rows = [
+            [date_str, name, ", ".join(regions_by_holiday[date_str, name])]
+            for date_str, name in sorted(regions_by_holiday)
+        ]
         if not rows:
             return "No bank holidays found in next 12 months\n"
         return SprintPresentation.build_aligned_table(rows, headers=["Date", "Name", "Regions"])
@@ -758,74 +1039,50 @@ class SprintPresentation:
         today = datetime.now().date()
         end_date = today + timedelta(days=13)  # 2 weeks
         
-        # Collect all team members and POIs (remove duplicates)
-        team_members = [m.name for m in team.team_members]
-        pois = team.people_of_interest + [team.manager]
-        all_people = list(dict.fromkeys(team_members + pois))  # Preserves order, removes duplicates
+        # Team members and POIs, sorted once per team and shared across renders
+        all_people = _calendar_people(team)
         
-        # Build absence map from sprint data
-        absence_map = {}
-        for person in all_people:
-            absence_map[person] = set()
+        # Absences and L1/L2 days are kept as per-person day bitmasks relative to
+        # today, so an absence is one shift-and-or however long it runs
+        span = (end_date - today).days + 1
+        absence_bits = dict.fromkeys(all_people, 0)
+        l1_bits = dict.fromkeys(all_people, 0)
+        l2_bits = dict.fromkeys(all_people, 0)
         
-        # Build L1/L2 maps (map PagerDuty names to actual names)
-        pd_to_name = {}
-        for m in team.team_members:
-            pd_name = getattr(m, "pagerduty_name", m.name)
-            pd_to_name[pd_name] = m.name
+        # Map PagerDuty names to actual names for L1/L2
+        pd_to_name = _calendar_pd_names(team)
+        # Bit of each day in the window by ISO string, so on-call dates stored as
+        # strings are looked up rather than parsed
+        day_bit = {(today + timedelta(days=k)).isoformat(): 1 << k for k in range(span)}
+        today_iso = today.isoformat()
+        end_iso = end_date.isoformat()
         
-        l1_map = {}
-        l2_map = {}
-        for person in all_people:
-            l1_map[person] = set()
-            l2_map[person] = set()
-        
-        for sprint in data['sprints']:
-            # Process team member holidays
-            for row in sprint.get('holidays', []):
-                name = row[0]
-                if name in all_people:
-                    absences = SprintPresentation.safe_eval_absences(row[2]) if len(row) > 2 else []
-                    for a in absences:
-                        start = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                        end = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
-                        start_dt = datetime.strptime(start, '%Y-%m-%d').date()
-                        end_dt = datetime.strptime(end, '%Y-%m-%d').date()
-                        for n in range((end_dt - start_dt).days + 1):
-                            absence_map[name].add(start_dt + timedelta(days=n))
-            
-            # Process POI/manager holidays
-            for row in sprint.get('poi_manager_holidays', []):
-                name = row[0]
-                if name in all_people:
-                    absences = SprintPresentation.safe_eval_absences(row[2]) if len(row) > 2 else []
-                    for a in absences:
-                        start = a[0] if isinstance(a[0], str) else a[0].strftime('%Y-%m-%d')
-                        end = a[1] if isinstance(a[1], str) else a[1].strftime('%Y-%m-%d')
-                        start_dt = datetime.strptime(start, '%Y-%m-%d').date()
-                        end_dt = datetime.strptime(end, '%Y-%m-%d').date()
-                        for n in range((end_dt - start_dt).days + 1):
-                            absence_map[name].add(start_dt + timedelta(days=n))
-            
-            # Process L1 assignments
-            for pd_name, dates in sprint.get('l1', {}).items():
-                actual_name = pd_to_name.get(pd_name, pd_name)
-                if actual_name in all_people:
-                    for date_str in dates:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date() if isinstance(date_str, str) else date_str
-                        if today <= date_obj <= end_date:
-                            l1_map[actual_name].add(date_obj)
+        holiday_index = SprintPresentation._index_absences(data)
+        poi_index = SprintPresentation._index_absences(data, 'poi_manager_holidays')
+        for sprint_idx, sprint in enumerate(data['sprints']):
+            # Only sprints overlapping the window can contribute to it
+            if sprint.get('end', end_iso) < today_iso or sprint.get('start', today_iso) > end_iso:
+                continue
+            # Process team member and POI/manager holidays
+            for index in (holiday_index, poi_index):
+                for name, start_dt, end_dt in index[sprint_idx]:
+                    if name in absence_bits:
+                        absence_bits[name] |= _range_bits(start_dt, end_dt, today, span)
             
-            # Process L2 assignments
-            for pd_name, dates in sprint.get('l2', {}).items():
-                actual_name = pd_to_name.get(pd_name, pd_name)
-                if actual_name in all_people:
-                    for date_str in dates:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d').date() if isinstance(date_str, str) else date_str
-                        if today <= date_obj <= end_date:
-                            l2_map[actual_name].add(date_obj)
+            # Process L1 and L2 assignments
+            for level, level_bits in (('l1', l1_bits), ('l2', l2_bits)):
+                for pd_name, dates in sprint.get(level, {}).items():
+                    actual_name = pd_to_name.get(pd_name, pd_name)
+                    if actual_name in level_bits:
+                        mask = level_bits[actual_name]
+                        for d in dates:
+                            if isinstance(d, str):
+                                mask |= day_bit.get(d, 0)
+                            else:
+                                mask |= _day_bits((_as_date(d),), today, span)
+                        level_bits[actual_name] = mask
         
-        return SprintPresentation.render_calendar(all_people, absence_map, l1_map, l2_map, today, end_date)
+        return SprintPresentation._render_calendar_bits(all_people, absence_bits, l1_bits, l2_bits, today, end_date)
 
 
     @staticmethod
@@ -837,7 +1094,7 @@ class SprintPresentation:
         Mark with 'L1' or 'L2' if person is on-call, 'X' if absent, blank if working normally.
         
         Args:
-            all_people: List of all people to include
+            all_people: Sequence of all people to include, already sorted by name
             absence_map: Dictionary mapping names to sets of absence dates
             l1_map: Dictionary mapping names to sets of L1 assignment dates
             l2_map: Dictionary mapping names to sets of L2 assignment dates
@@ -847,69 +1104,71 @@ class SprintPresentation:
         Returns:
             Formatted calendar table string
         """
-        # Build list of weekdays in range
-        date_list = []
-        current = start_date
-        while current <= end_date:
-            if current.weekday() < 5:  # Monday=0, Friday=4
-                date_list.append(current)
-            current += timedelta(days=1)
-        
-        # Build headers
-        headers = ["Name"]
-        for d in date_list:
-            day_abbr = d.strftime('%a')
-            day_month = d.strftime('%d/%m')
-            headers.append(f"{day_abbr}\n{day_month}")
-        
-        # Build rows
-        rows = []
-        for person in sorted(all_people):
-            row = [person]
-            for d in date_list:
-                if d in l1_map.get(person, set()):
-                    row.append("L1")
-                elif d in l2_map.get(person, set()):
-                    row.append("L2")
-                elif d in absence_map.get(person, set()):
-                    row.append("X")
-                else:
-                    row.append("")
-            rows.append(row)
+        span = (end_date - start_date).days + 1
+        return SprintPresentation._render_calendar_bits(
+            all_people,
+            {p: _day_bits(absence_map.get(p, _EMPTY_SET), start_date, span) for p in all_people},
+            {p: _day_bits(l1_map.get(p, _EMPTY_SET), start_date, span) for p in all_people},
+            {p: _day_bits(l2_map.get(p, _EMPTY_SET), start_date, span) for p in all_people},
+            start_date,
+            end_date,
+        )
+
+
+    @staticmethod
+    def _render_calendar_bits(all_people, absence_bits, l1_bits, l2_bits, start_date, end_date):
+        """Render the render_calendar table from per-person day bitmasks.
+        
+        Args:
+            all_people: Sequence of all people to include, already sorted by name
+            absence_bits: Dictionary mapping names to absence day bitmasks
+            l1_bits: Dictionary mapping names to L1 day bitmasks
+            l2_bits: Dictionary mapping names to L2 day bitmasks
+            start_date: Start date for calendar, bit 0 of every mask
+            end_date: End date for calendar
+            
+        Returns:
+            Formatted calendar table string
+        """
+        # Weekday columns and their split headers depend only on the date range
+        date_list, day_offsets, header_lines_split, header_widths = _calendar_header(start_date, end_date)
+        
+        # Build rows: a people x days matrix of label codes, filled from each
+        # person's masks. Maps are applied lowest precedence first so L1
+        # overwrites L2, and L2 overwrites absence.
+        people = all_people
+        codes = np.zeros((len(people), len(date_list)), dtype=np.int8)
+        for code, bits in ((3, absence_bits), (2, l2_bits), (1, l1_bits)):
+            _fill_calendar_codes(codes, day_offsets, [bits.get(p, 0) for p in people], code)
+        rows = [[person] + labels for person, labels in zip(people, _CALENDAR_LABELS[codes].tolist())]
         
         # Custom table builder for multi-line headers
         if not rows:
             return "No data\n"
         
-        output = ""
-        # Calculate column widths
-        col_widths = []
-        for col_idx in range(len(headers)):
-            header_lines = headers[col_idx].split('\n')
-            max_header_width = max(len(line) for line in header_lines)
-            if col_idx < len(rows[0]):
-                max_data_width = max(len(str(row[col_idx])) for row in rows)
-                col_widths.append(max(max_header_width, max_data_width))
-            else:
-                col_widths.append(max_header_width)
+        # Calculate column widths: the widest data cell per column comes from one
+        # sweep over the code matrix, mapped through the label lengths
+        data_widths = [max(len(person) for person in people)]
+        data_widths += _CALENDAR_LABEL_WIDTHS[codes].max(axis=0).tolist()
+        widths = tuple(map(max, header_widths, data_widths))
+        # One format string for the whole geometry, shared by renders with the
+        # same widths, so rows are padded in a single call each
+        row_format = _row_format(widths)
         
-        # Print multi-line headers
-        header_lines_split = [h.split('\n') for h in headers]
+        # Print multi-line headers; shorter headers are padded with blank cells
+        lines = []
         max_header_height = max(len(h) for h in header_lines_split)
         for line_idx in range(max_header_height):
-            line_parts = []
-            for col_idx, header_parts in enumerate(header_lines_split):
-                if line_idx < len(header_parts):
-                    line_parts.append(f"{header_parts[line_idx]:<{col_widths[col_idx]}}")
-                else:
-                    line_parts.append(" " * col_widths[col_idx])
-            output += "  ".join(line_parts) + "\n"
+            lines.append(row_format.format(*[
+                header_parts[line_idx] if line_idx < len(header_parts) else ""
+                for header_parts in header_lines_split
+            ]))
         
         # Print separator
-        output += "  ".join("-" * w for w in col_widths) + "\n"
+        lines.append("  ".join("-" * w for w in widths) + "\n")
         
-        # Print data rows
-        for row in rows:
-            output += "  ".join(f"{str(item):<{w}}" for item, w in zip(row, col_widths)) + "\n"
+        # Print data rows; a comprehension joined once measured faster than
+        # either appending in a loop or StringIO.writelines
+        lines += [row_format.format(*row) for row in rows]
         
-        return output
\ No newline at end of file
+        return "".join(lines)
\ No newline at end of file
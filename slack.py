@@ -1,7 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import hashlib
+import json
+import sys
 import requests
-from config import slack_api_key
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import config
 from presentation import SprintPresentation
 
+# Rendered canvas texts keyed by (team name, today, digest of the sprint data), so
+# pushing the same data again (a retry, or a second run in the same process) skips
+# re-rendering. The day is part of the key because the calendar and bank holiday
+# views are relative to today.
+_rendered_canvases = {}
+_RENDERED_CANVASES_MAX = 32
+
+
+def _data_digest(data):
+    """Stable digest of the sprint data, ignoring renderer bookkeeping keys."""
+    public = {k: v for k, v in data.items() if not k.startswith('_')}
+    encoded = json.dumps(public, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _render_canvas_texts(data, team):
+    """Render the capacity, absences and support canvas texts for a team (memoised).
+    
+    Args:
+        data: Sprint data dictionary
+        team: Team object with canvas IDs
+        
+    Returns:
+        Dictionary mapping canvas kind to text, for the canvases the team has configured
+    """
+    key = (team.name, date.today(), _data_digest(data))
+    texts = _rendered_canvases.get(key)
+    if texts is None:
+        texts = {}
+        # capacity (includes calendar)
+        if team.capacity_canvas:
+            capacity_text = SprintPresentation.render_capacity_table(data)
+            calendar_text = SprintPresentation.render_calendar_view(data, team)
+            texts["capacity"] = capacity_text + "\n\nCalendar\n\n" + calendar_text
+        if team.absences_canvas:
+            texts["absences"] = SprintPresentation.render_absences_and_oncall(data, team)
+        if team.support_canvas:
+            texts["support"] = SprintPresentation.render_support(data, team)
+        if len(_rendered_canvases) >= _RENDERED_CANVASES_MAX:
+            _rendered_canvases.clear()
+        _rendered_canvases[key] = texts
+    return texts
+
 
 class Slack:
     """Slack API client for updating canvas documents with sprint data."""
@@ -9,6 +59,18 @@ class Slack:
     def __init__(self, api_key):
         self.api_key = api_key
         self.base_url = "https://slack.com/api/"
+        # One pooled session per client so consecutive canvas updates reuse the
+        # TLS connection. canvases.edit replaces the whole document, so retrying
+        # a POST on 429/5xx is safe.
+        self.session = requests.Session()
+        self.session.headers.update({
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json"
+        })
+        retry = Retry(total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset({"POST"}), respect_retry_after_header=True,
+                      raise_on_status=False)
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry))
 
 
     def update_canvas(self, canvas_id, content):
@@ -22,10 +84,6 @@ class Slack:
             JSON response from the Slack API
         """
         url = self.base_url + "canvases.edit"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
         payload = {
             "canvas_id": canvas_id,
             "changes": [
@@ -38,8 +96,23 @@ class Slack:
                 }
             ]
         }
-        response = requests.post(url, json=payload, headers=headers)
-        return response.json()
+        return Slack._response_json(self.session.post(url, json=payload))
+
+
+    @staticmethod
+    def _response_json(response):
+        """Decode a Slack API response, treating a non-JSON body as an error result.
+        
+        Args:
+            response: Response from the Slack API
+            
+        Returns:
+            Dictionary with at least an "ok" key
+        """
+        try:
+            return response.json()
+        except ValueError:
+            return {"ok": False, "error": f"HTTP {response.status_code}"}
     
     @staticmethod
     def send_sprint_data_to_slack(data, team):
@@ -51,19 +124,50 @@ class Slack:
             data: Sprint data dictionary with capacity and availability information
             team: Team object with canvas IDs for Slack integration
         """
+        Slack.send_sprint_data_to_slack_many({team: data})
+
+    @staticmethod
+    def send_sprint_data_to_slack_many(datas_by_team, max_workers=8):
+        """Send sprint data for several teams to their Slack canvases.
         
-        slack = Slack(api_key=slack_api_key)
-        # capacity (includes calendar)
-        if team.capacity_canvas:
-            capacity_text = SprintPresentation.render_capacity_table(data)
-            calendar_text = SprintPresentation.render_calendar_view(data, team)
-            text = capacity_text + "\n\nCalendar\n\n" + calendar_text
-            slack.update_canvas(team.capacity_canvas, text)
-        # absences
-        if team.absences_canvas:
-            text = SprintPresentation.render_absences_and_oncall(data, team)
-            slack.update_canvas(team.absences_canvas, text)
-        # support
-        if team.support_canvas:
-            text = SprintPresentation.render_support(data, team)
-            slack.update_canvas(team.support_canvas, text)
+        Every team's canvas updates are in flight together, sharing one client's
+        pooled connections.
+        
+        Args:
+            datas_by_team: Dictionary mapping Team objects to their sprint data
+            max_workers: Maximum number of concurrent canvas updates
+            
+        Returns:
+            List of (canvas_id, error) for the canvas updates Slack refused; each is
+            also reported on stderr
+        """
+        slack = Slack(api_key=config.slack_api_key)
+        # Texts per canvas, in kind order. A document replace overwrites the whole
+        # canvas, so texts that share a canvas are merged into a single update
+        # rather than racing to replace each other.
+        texts_by_canvas = {}
+        for team, data in datas_by_team.items():
+            texts = _render_canvas_texts(data, team)
+            # capacity (includes calendar), absences and support
+            for kind, canvas_id in (
+                ("capacity", team.capacity_canvas),
+                ("absences", team.absences_canvas),
+                ("support", team.support_canvas),
+            ):
+                if canvas_id:
+                    texts_by_canvas.setdefault(canvas_id, []).append(texts[kind])
+        updates = [(canvas_id, "\n\n".join(parts)) for canvas_id, parts in texts_by_canvas.items()]
+        if not updates:
+            return []
+        # The canvas updates are independent round trips, so send them concurrently
+        # over the client's pooled session
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(updates))) as executor:
+            results = list(executor.map(lambda update: slack.update_canvas(*update), updates))
+        failures = [
+            (canvas_id, result.get("error", "unknown error"))
+            for (canvas_id, _), result in zip(updates, results)
+            if not result.get("ok")
+        ]
+        for canvas_id, error in failures:
+            print(f"Failed to update Slack canvas {canvas_id}: {error}", file=sys.stderr)
+        return failures
@@ -1,52 +1,337 @@
-from datetime import datetime, timedelta
-from lxml import objectify
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from lxml import etree
+import gzip
+import io
 import json
 import numpy as np
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
+import threading
 import argparse
-from jirautils.service.Roadmap import Roadmap
+import config
 from config import *
 from slack import Slack
 from presentation import SprintPresentation
 import os
 import pickle
 
+# orjson parses the PagerDuty responses (and reads and writes the JSON cache
+# files) faster when it is installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_loads = json.loads
 
-_employee_directory_tree_cache = None
+    def _json_dumps(obj):
+        return json.dumps(obj).encode()
+
+
+_employee_directory_cache = None
 _sprint_fte_cache = None
 
+# Shared read-only default for dict lookups, so a miss doesn't allocate a new set
+_EMPTY_SET = frozenset()
+
+# Social dates in order, for binary-searching each sprint's socials
+_sorted_social_dates = tuple(sorted(social_dates))
 
-def cache_api_response(cache_key, fetch_func, timeout_seconds):
-    """Cache API responses to disk with expiry.
+
+def socials_between(first_day, last_day):
+    """List the social dates from first_day to last_day inclusive, in order.
+    
+    Args:
+        first_day: First date of the range
+        last_day: Last date of the range
+        
+    Returns:
+        List of social dates
+    """
+    lo = bisect_left(_sorted_social_dates, first_day)
+    return list(_sorted_social_dates[lo:bisect_right(_sorted_social_dates, last_day, lo)])
+
+
+# Baked into every on-disk cache file name; bump it whenever the shape of a cached
+# payload changes so entries written by older code are never read back
+API_CACHE_SCHEMA_VERSION = "v3"
+# In-process layer in front of the on-disk API cache: cache_key -> (timestamp, data),
+# plus a lock per key so concurrent callers of the same key fetch it only once, and
+# the keys whose expired entries are being refetched in the background
+_api_memory_cache = {}
+_api_cache_locks = {}
+_api_cache_locks_guard = threading.Lock()
+_api_cache_refreshing = set()
+
+
+# Pooled HTTP sessions, one per API host so each keeps its own keep-alive
+# connections and credentials; created on first use
+_api_sessions = {}
+_api_sessions_lock = threading.Lock()
+# (connect, read) timeout in seconds for every API request, so a stalled server
+# fails the request instead of hanging the run
+_API_REQUEST_TIMEOUT = (10, 60)
+
+
+def _api_session(name):
+    """Return the shared requests session for an API, creating it on first use.
+    
+    Args:
+        name: Either "bamboohr" or "pagerduty"
+        
+    Returns:
+        requests.Session with connection pooling, retries and the API's credentials
+    """
+    session = _api_sessions.get(name)
+    if session is not None:
+        return session
+    with _api_sessions_lock:
+        if name not in _api_sessions:
+            session = requests.Session()
+            retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False)
+            session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+            if name == "bamboohr":
+                session.auth = (config.bamboo_hr_api_key, 'x')
+            else:
+                session.headers.update({
+                    "Accept": "application/json",
+                    "Authorization": f"Token token={config.pagerduty_api_key}"
+                })
+            _api_sessions[name] = session
+        return _api_sessions[name]
+
+
+def _api_cache_file(cache_key, extension="json.gz"):
+    """Return the on-disk cache file for an API response.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        extension: "json.gz" for JSON-encodable entries, "pkl" for anything else
+        
+    Returns:
+        Path of the versioned file holding the response
+    """
+    return os.path.join("./.api_cache", f"{API_CACHE_SCHEMA_VERSION}_{cache_key}.{extension}")
+
+
+def _read_api_cache_entry(cache_key):
+    """Read a cache entry from disk.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        
+    Returns:
+        Dictionary with "timestamp", "data" and "etag", or None if nothing is cached
+    """
+    # Each format is opened directly (no exists() check first), so a miss costs one
+    # failed open; entries in the older formats (uncompressed JSON, pickle) are
+    # still read until they expire
+    try:
+        with open(_api_cache_file(cache_key), "rb") as f:
+            return _json_loads(gzip.decompress(f.read()))
+    except FileNotFoundError:
+        pass
+    try:
+        with open(_api_cache_file(cache_key, "json"), "rb") as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        pass
+    try:
+        # Pickled payloads can be large; a 1 MiB buffer reads them in few syscalls
+        with open(_api_cache_file(cache_key, "pkl"), "rb", buffering=1 << 20) as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _write_api_cache_entry(cache_key, entry):
+    """Atomically write a cache entry to disk.
+    
+    Entries that survive a JSON round trip unchanged (the raw BambooHR XML and
+    PagerDuty JSON text, the directory records) are stored as gzipped JSON, which
+    needs no unpickling to read back and shrinks the XML several-fold. Anything
+    else, such as tuples or non-string keys, is pickled so it reads back exactly.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        entry: Dictionary with "timestamp", "data" and "etag"
+    """
+    try:
+        payload = _json_dumps(entry)
+        exact = _json_loads(payload) == entry
+    except (TypeError, ValueError):
+        exact = False
+    if exact:
+        # The fastest level; the XML still compresses several-fold
+        extension, payload = "json.gz", gzip.compress(payload, compresslevel=1)
+    else:
+        extension, payload = "pkl", pickle.dumps(entry)
+    cache_file = _api_cache_file(cache_key, extension)
+    # Write atomically, so a reader never sees a half-written file
+    tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_file, cache_file)
+    # Reads stop at the first format found, so a copy in another format must not linger
+    for other in ("json.gz", "json", "pkl"):
+        if other != extension:
+            try:
+                os.remove(_api_cache_file(cache_key, other))
+            except FileNotFoundError:
+                pass
+
+
+def _api_cache_key_lock(cache_key):
+    """Return the lock serialising fetches of one cache key.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        
+    Returns:
+        threading.Lock shared by every caller of the key
+    """
+    with _api_cache_locks_guard:
+        return _api_cache_locks.setdefault(cache_key, threading.Lock())
+
+
+def _fetch_into_api_cache(cache_key, fetch_func, conditional, stale):
+    """Fetch fresh data and store it in the memory and disk caches.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        fetch_func: Function to call to fetch fresh data
+        conditional: Whether fetch_func revalidates with an ETag (see cache_api_response)
+        stale: The expired disk entry, or None
+        
+    Returns:
+        The fetched (or revalidated) data
+    """
+    now = datetime.now().timestamp()
+    etag = None
+    if conditional:
+        data, etag = fetch_func(stale.get("etag") if stale else None)
+        if data is None:
+            data = stale["data"]
+    else:
+        data = fetch_func()
+    _write_api_cache_entry(cache_key, {"timestamp": now, "data": data, "etag": etag})
+    _api_memory_cache[cache_key] = (now, data)
+    return data
+
+
+def _refresh_api_cache_in_background(cache_key, fetch_func, conditional, stale):
+    """Refetch an expired cache entry without blocking the caller.
+    
+    The thread is a daemon, so a CLI run exits once its output is printed; a
+    refresh cut off at exit leaves the stale entry in place (entries are written
+    atomically) and the next run refreshes it again.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        fetch_func: Function to call to fetch fresh data
+        conditional: Whether fetch_func revalidates with an ETag (see cache_api_response)
+        stale: The expired disk entry still being served
+    """
+    def refresh():
+        try:
+            with _api_cache_key_lock(cache_key):
+                _fetch_into_api_cache(cache_key, fetch_func, conditional, stale)
+        except Exception as e:
+            # Keep serving the stale entry, but don't hide why it couldn't be refreshed
+            print(f"Failed to refresh cached {cache_key}: {e!r}", file=sys.stderr)
+        finally:
+            _api_cache_refreshing.discard(cache_key)
+    threading.Thread(target=refresh, name=f"api-cache-refresh-{cache_key}", daemon=True).start()
+
+
+def cache_api_response(cache_key, fetch_func, timeout_seconds, conditional=False):
+    """Cache API responses in memory and on disk with expiry.
+    
+    An entry that has expired by less than api_cache_stale_window seconds is still
+    returned straight away, while a background thread refetches it.
     
     Args:
         cache_key: Unique identifier for the cached data
         fetch_func: Function to call to fetch fresh data if cache is invalid
         timeout_seconds: Cache expiry time in seconds
+        conditional: If True, fetch_func takes the expired entry's ETag (or None) and
+            returns (data, etag), with data None when the server reports it unchanged
         
     Returns:
         Cached or freshly fetched data
     """
-    cache_dir = "./.api_cache"
-    os.makedirs(cache_dir, exist_ok=True)
-    cache_file = os.path.join(cache_dir, f"{cache_key}.pkl")
     now = datetime.now().timestamp()
-    # Try to load cache
-    if os.path.exists(cache_file):
+    stale_until = timeout_seconds + api_cache_stale_window
+    cached = _api_memory_cache.get(cache_key)
+    if cached is not None:
+        age = now - cached[0]
+        # While a refresh is running, its stale entry is served without waiting on it
+        if age < timeout_seconds or (cache_key in _api_cache_refreshing and age < stale_until):
+            return cached[1]
+    with _api_cache_key_lock(cache_key):
+        # Another caller may have loaded the key while this one waited
+        cached = _api_memory_cache.get(cache_key)
+        if cached is not None and now - cached[0] < timeout_seconds:
+            return cached[1]
+        os.makedirs("./.api_cache", exist_ok=True)
+        # Try to load cache
+        stale = None
         try:
-            with open(cache_file, "rb") as f:
-                cached = pickle.load(f)
-            if now - cached["timestamp"] < timeout_seconds:
-                return cached["data"]
+            cached = _read_api_cache_entry(cache_key)
+            if cached is not None:
+                if now - cached["timestamp"] < timeout_seconds:
+                    _api_memory_cache[cache_key] = (cached["timestamp"], cached["data"])
+                    return cached["data"]
+                stale = cached
         except Exception:
             pass
-    # Fetch new data
-    data = fetch_func()
-    with open(cache_file, "wb") as f:
-        pickle.dump({"timestamp": now, "data": data}, f)
-    return data
+        # Serve a recently expired entry and refetch it in the background
+        if stale is not None and now - stale["timestamp"] < stale_until:
+            _api_memory_cache[cache_key] = (stale["timestamp"], stale["data"])
+            if cache_key not in _api_cache_refreshing:
+                _api_cache_refreshing.add(cache_key)
+                _refresh_api_cache_in_background(cache_key, fetch_func, conditional, stale)
+            return stale["data"]
+        # Fetch new data, revalidating an expired entry when the API supports it
+        return _fetch_into_api_cache(cache_key, fetch_func, conditional, stale)
+
+
+def invalidate_api_cache(cache_key=None):
+    """Drop cached API responses from memory and disk.
+    
+    The process-wide memos in front of the cache (the employee directory, the
+    JIRA FTE counts and the PagerDuty users) are dropped along with their entries.
+    
+    Args:
+        cache_key: Key of the response to drop, or None to drop every cached response
+    """
+    global _employee_directory_cache, _sprint_fte_cache, _pagerduty_users_cache
+    if cache_key in (None, "bamboohr_directory_records"):
+        _employee_directory_cache = None
+    if cache_key in (None, "future_sprint_fte"):
+        _sprint_fte_cache = None
+    if cache_key is None:
+        _pagerduty_users_cache = None
+        _api_memory_cache.clear()
+        cache_dir = "./.api_cache"
+        if os.path.isdir(cache_dir):
+            with os.scandir(cache_dir) as entries:
+                file_paths = [entry.path for entry in entries]
+        else:
+            file_paths = []
+    else:
+        _api_memory_cache.pop(cache_key, None)
+        file_paths = [_api_cache_file(cache_key, ext) for ext in ("json.gz", "json", "pkl")]
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
 
 
 def get_future_sprint_fte():
@@ -59,7 +344,10 @@ def get_future_sprint_fte():
     if _sprint_fte_cache is not None:
         return _sprint_fte_cache
     def fetch():
-        rm = Roadmap(JIRA_API_KEY=jira_api_key)
+        # Imported on first use, so outputs that need no JIRA data (such as -bankhols)
+        # don't pay for importing the jirautils submodule
+        from jirautils.service.Roadmap import Roadmap
+        rm = Roadmap(JIRA_API_KEY=config.jira_api_key)
         rm.auth = rm.get_auth()
         future_epics = rm.get_future_epics()
         extracted_data = rm.extract_data_from_epics(future_epics)
@@ -69,39 +357,96 @@ def get_future_sprint_fte():
     return _sprint_fte_cache
 
 
-def sprint_start(d):
-    """Calculate the start date of the sprint containing the given date.
+def count_weekdays(first_day, num_days):
+    """Count the Monday-Friday days among num_days consecutive days.
+    
+    Args:
+        first_day: First date of the run
+        num_days: Number of days in the run
+        
+    Returns:
+        int: The number of weekdays
+    """
+    # Whole weeks contribute 5 each; the remaining days run from first_day's
+    # weekday, possibly wrapping past Sunday into the next week
+    weeks, rest = divmod(num_days, 7)
+    weekday = first_day.weekday()
+    return weeks * 5 + max(0, min(weekday + rest, 5) - weekday) + max(0, weekday + rest - 7)
+
+
+def _iter_xml_elements(raw_xml, tag):
+    """Stream the elements with the given tag from an XML document.
+    
+    Each element is cleared, and its already-processed siblings are released,
+    once the caller moves on to the next, so the full tree is never built.
+    
+    Args:
+        raw_xml: XML document as a string or bytes
+        tag: Tag of the elements to yield
+        
+    Yields:
+        lxml elements, valid until the next element is requested
+    """
+    if isinstance(raw_xml, str):
+        raw_xml = raw_xml.encode("utf-8")
+    for _, element in etree.iterparse(io.BytesIO(raw_xml), tag=tag):
+        yield element
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+# cache_key -> (raw whos_out XML, its parsed items), so the core, POI and xmas rota
+# lookups sharing one cached response parse it only once
+_whos_out_items_cache = {}
+
+
+def _whos_out_items(cache_key, raw_xml):
+    """Parse the employee absences out of a BambooHR whos_out response.
     
-    Sprints start on odd-numbered Mondays (week 1, 3, 5, etc.).
+    The result is reused for as long as the cache keeps returning the same
+    response object for the key.
     
     Args:
-        d: Date to find the sprint start for
+        cache_key: API cache key the response was read from
+        raw_xml: whos_out XML document
         
     Returns:
-        datetime: The Monday that starts the sprint containing d
+        List of (employee_id, employee_name, start_iso, end_iso) tuples; company
+        holidays, which have no employee, are skipped
     """
-    weekday = 0 # Monday
-    days_ahead = weekday - d.weekday()
-    if days_ahead <= 0: # Target day already happened this week
-        days_ahead += 7
-    target_date = d + timedelta(days_ahead)
-    week = int(target_date.strftime("%V"))
-    if week % 2 == 0: # even numbered week
-        return target_date - timedelta(14)
-    return target_date - timedelta(7) # odd numbered week
+    cached = _whos_out_items_cache.get(cache_key)
+    if cached is not None and cached[0] is raw_xml:
+        return cached[1]
+    items = []
+    for item in _iter_xml_elements(raw_xml, "item"):
+        employee = item.find("employee")
+        if employee is not None:
+            items.append((employee.get("id"), employee.text, item.findtext("start"), item.findtext("end")))
+    _whos_out_items_cache[cache_key] = (raw_xml, items)
+    return items
 
 
-def get_sprint_number(current_sprint_start):
-    """Calculate the sprint number based on the start date.
+def _bamboohr_holidays_fetch_range(start, end):
+    """Widen a holiday query range to whole calendar quarters.
     
     Args:
-        current_sprint_start: Start date of the sprint
+        start: Start date (or datetime) of the query range
+        end: End date (or datetime) of the query range
         
     Returns:
-        int: The sprint number
+        Tuple of (fetch_start, fetch_end, cache_key) for the widened range
     """
-    delta = current_sprint_start - datetime.strptime(str(first_sprint_date), date_format)
-    return int(first_sprint_number + (delta.days / 14))
+    start = start.date() if hasattr(start, 'date') else start
+    end = end.date() if hasattr(end, 'date') else end
+    fetch_start = date(start.year, (start.month - 1) // 3 * 3 + 1, 1)
+    end_quarter_month = (end.month - 1) // 3 * 3 + 3
+    if end_quarter_month == 12:
+        fetch_end = date(end.year, 12, 31)
+    else:
+        fetch_end = date(end.year, end_quarter_month + 1, 1) - timedelta(days=1)
+    cache_key = f"bamboohr_holidays_{fetch_start.strftime('%Y%m%d')}_{fetch_end.strftime('%Y%m%d')}"
+    return fetch_start, fetch_end, cache_key
 
 
 def fetch_bamboohr_holidays(start, end, employee_id_list):
@@ -113,73 +458,101 @@ def fetch_bamboohr_holidays(start, end, employee_id_list):
         employee_id_list: List of employee IDs to fetch absences for
         
     Returns:
-        Dictionary mapping employee objects to lists of absence periods
+        Dictionary mapping (employee_id, employee_name) to lists of absence periods
     """
-    def fetch():
+    # Every caller within the same quarters shares one request and cache entry;
+    # items outside the requested range are dropped below
+    fetch_start, fetch_end, cache_key = _bamboohr_holidays_fetch_range(start, end)
+    def fetch(etag):
         holiday_uri = 'https://api.bamboohr.com/api/gateway.php/brdge/v1/time_off/whos_out?start={0}&end={1}'
-        # start and end may already be datetime.date objects
-        start_str = start.strftime('%Y-%m-%d') if hasattr(start, 'strftime') else str(start)
-        end_str = end.strftime('%Y-%m-%d') if hasattr(end, 'strftime') else str(end)
-        holiday_request = requests.get(holiday_uri.format(start_str, end_str), auth=(bamboo_hr_api_key, 'x'))
-        return holiday_request.text
-    cache_key = f"bamboohr_holidays_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}"
-    raw_xml = cache_api_response(cache_key, fetch, api_cache_timeout)
-    calendar = objectify.fromstring(raw_xml)
+        headers = {"If-None-Match": etag} if etag else None
+        holiday_request = _api_session("bamboohr").get(
+            holiday_uri.format(fetch_start.isoformat(), fetch_end.isoformat()), headers=headers, timeout=_API_REQUEST_TIMEOUT
+        )
+        # An expired entry the server confirms unchanged is kept as is
+        if holiday_request.status_code == 304:
+            return None, etag
+        return holiday_request.text, holiday_request.headers.get("ETag")
+    raw_xml = cache_api_response(cache_key, fetch, api_cache_timeout, conditional=True)
+    range_start = (start.date() if hasattr(start, 'date') else start).isoformat()
+    range_end = (end.date() if hasattr(end, 'date') else end).isoformat()
+    wanted_ids = set(employee_id_list)
     employee_days = {}
-    if hasattr(calendar, 'item'):
-        for item in calendar.item:
-            employee_id = item.employee.attrib["id"]
-            if employee_id in employee_id_list:
-                if item.employee not in employee_days:
-                    employee_days[item.employee] = []
-                # start and end are already datetime.date objects
-                # Ensure both are datetime.date for comparison
-                check_start = start.date() if hasattr(start, 'date') else start
-                item_start = datetime.strptime(str(item.start), date_format).date()
-                if item_start > check_start:
-                    check_start = item_start
-                check_end = end.date() if hasattr(end, 'date') else end
-                item_end = datetime.strptime(str(item.end), date_format).date()
-                if item_end <= check_end:
-                    check_end = item_end
-                delta = np.busday_count(str(item.start), str(item.end))
-                if np.is_busday(str(item.end)):
-                    delta += 1
-                sprint_delta = np.busday_count(check_start, check_end)
-                if np.is_busday(check_end):
-                    sprint_delta += 1
-                employee_days[item.employee].append([item.start, item.end, int(delta), int(sprint_delta)])
+    item_emps = []
+    item_starts = []
+    item_ends = []
+    for employee_id, employee_name, item_start, item_end in _whos_out_items(cache_key, raw_xml):
+        if employee_id in wanted_ids:
+            if item_end < range_start or item_start > range_end:
+                continue
+            emp = (employee_id, employee_name)
+            if emp not in employee_days:
+                employee_days[emp] = []
+            item_emps.append(emp)
+            item_starts.append(item_start)
+            item_ends.append(item_end)
+    # Parse every absence's bounds and count its business days in one vectorised
+    # pass, both in full and clipped to the query range. A half-open end one day
+    # past the inclusive end counts the last day in the same call, and keeping
+    # that end at or after the start makes non-overlapping ranges count 0.
+    one_day = np.timedelta64(1, 'D')
+    starts = np.array(item_starts, dtype='datetime64[D]')
+    ends = np.array(item_ends, dtype='datetime64[D]')
+    deltas = np.busday_count(starts, np.maximum(ends + one_day, starts))
+    check_starts = np.maximum(starts, np.datetime64(start.date() if hasattr(start, 'date') else start, 'D'))
+    check_ends = np.minimum(ends, np.datetime64(end.date() if hasattr(end, 'date') else end, 'D')) + one_day
+    sprint_deltas = np.busday_count(check_starts, np.maximum(check_ends, check_starts))
+    for emp, item_start, item_end, delta, sprint_delta in zip(
+        item_emps, item_starts, item_ends, deltas.tolist(), sprint_deltas.tolist()
+    ):
+        employee_days[emp].append([item_start, item_end, delta, sprint_delta])
     return employee_days
 
 
+# Directory fields kept per employee record
+_DIRECTORY_FIELDS = ("displayName", "preferredName", "lastName", "division")
+
+
 def fetch_employee_directory_tree():
     """Fetch and cache the employee directory from BambooHR.
     
+    The XML is reduced to plain records as it is parsed, so what gets pickled to the
+    API cache is a small list of dicts rather than an lxml tree.
+    
     Returns:
-        lxml.objectify tree of employee directory data
+        List of employee record dicts with an "id" key and the text of each of the
+        _DIRECTORY_FIELDS the employee has
     """
-    global _employee_directory_tree_cache
-    if _employee_directory_tree_cache is not None:
-        return _employee_directory_tree_cache
+    global _employee_directory_cache
+    if _employee_directory_cache is not None:
+        return _employee_directory_cache
     def fetch():
         directory_uri = 'https://api.bamboohr.com/api/gateway.php/brdge/v1/employees/directory'
-        directory_request = requests.get(directory_uri, auth=(bamboo_hr_api_key, 'x'))
-        return objectify.fromstring(directory_request.text)
-    _employee_directory_tree_cache = cache_api_response(
-        "bamboohr_directory",
+        directory_request = _api_session("bamboohr").get(directory_uri, timeout=_API_REQUEST_TIMEOUT)
+        records = []
+        for employee in _iter_xml_elements(directory_request.content, "employee"):
+            record = {"id": employee.get("id")}
+            for field in employee.iterchildren(tag="field"):
+                field_id = field.get("id")
+                if field_id in _DIRECTORY_FIELDS and field_id not in record:
+                    record[field_id] = field.text
+            records.append(record)
+        return records
+    _employee_directory_cache = cache_api_response(
+        "bamboohr_directory_records",
         fetch,
         getattr(sys.modules[__name__], "api_cache_timeout", 3600)
     )
-    return _employee_directory_tree_cache
+    return _employee_directory_cache
 
 
-def get_employee_id_list_from_tree(tree, team):
-    """Extract employee IDs and names from the directory tree.
+def get_employee_id_list_from_tree(records, team):
+    """Extract employee IDs and names from the employee directory records.
     
     Separates core team members from POI (people of interest) and manager.
     
     Args:
-        tree: Employee directory tree from BambooHR
+        records: Employee directory records from fetch_employee_directory_tree
         team: Team object with member names and POI list
         
     Returns:
@@ -189,12 +562,14 @@ def get_employee_id_list_from_tree(tree, team):
     core_display_names = []
     poi_employee_ids = []
     poi_display_names = []
-    member_bamboo_names = [m.bamboo_name for m in team.team_members]
-    for employee in tree.employees.employee:
-        employee_id = employee.attrib["id"]
-        display_name = employee.find(".//field[@id='displayName']")
+    # Names are matched by set membership once per directory employee
+    member_bamboo_names = frozenset(team.bamboo_names)
+    poi_bamboo_names = frozenset([*team.poi_bamboo_names, team.manager])
+    for employee in records:
+        employee_id = employee["id"]
+        display_name = employee.get("displayName")
         # Exclude manager and people_of_interest from core team
-        if display_name == team.manager or display_name in team.poi_bamboo_names:
+        if display_name in poi_bamboo_names:
             poi_employee_ids.append(employee_id)
             poi_display_names.append(display_name)
         if display_name in member_bamboo_names:
@@ -225,103 +600,70 @@ def get_team_availability(sprint_start_date, sprint_end_date, l1_dict, l2_dict,
     leavers_this_sprint = []
     starters_this_sprint = []
     ramping_this_sprint = []
-    socials_in_sprint = [d for d in social_dates if sprint_start_date.strftime(date_format) <= d <= sprint_end_date.strftime(date_format)]
+    # Member start/leave dates are parsed to dates once, when each TeamMember is built;
+    # the sprint bounds are converted once here rather than per member and branch
+    sprint_start_day = sprint_start_date.date()
+    sprint_end_day = sprint_end_date.date()
+    socials_in_sprint = socials_between(sprint_start_day, sprint_end_day)
     social_penalty = 1 if socials_in_sprint else 0
     for member in team.team_members:
         name_str = member.name
         bamboo_name = member.bamboo_name
-        pd_name = getattr(member, "pagerduty_name", name_str)
+        pd_name = member.pagerduty_name
         start_date = getattr(member, "start_date", None)
         base_pct = getattr(member, "start_pct", 1)
         leave_date = getattr(member, "leave_date", None)
         days_in_sprint = 10
-        holidays = holidays_dict.get(bamboo_name, set())
-        l1_days = len(l1_dict.get(pd_name, []))
-        l2_days = len(l2_dict.get(pd_name, []))
-        actual_available = days_in_sprint - len(holidays) - l1_days - social_penalty
-        available = max(0, actual_available)
-        name_display = name_str
-        days_display = f"{available}"
+        holidays = holidays_dict.get(bamboo_name, _EMPTY_SET)
+        l1_days = len(l1_dict.get(pd_name, _EMPTY_SET))
+        l2_days = len(l2_dict.get(pd_name, _EMPTY_SET))
+        holidays_n = len(holidays)
+        # Sprint capacity before any starter/leaver adjustment; each branch below
+        # only overrides actual_available when its dates cut into the sprint
+        base_available = max(0, days_in_sprint - holidays_n - l1_days - social_penalty)
+        actual_available = base_available
         exclude_from_counts = False
-        # Handle leavers
-        leave_dt = None
-        if leave_date:
-            leave_dt = datetime.strptime(leave_date, date_format).date()
-            if leave_dt < sprint_start_date.date():
-                actual_available = available = 0
-                name_display = name_str
-                days_display = "0"
+        ramp_multiplier = 1.0
+        leave_dt = leave_date
+        if leave_dt:
+            if leave_dt < sprint_start_day:
+                actual_available = 0
                 exclude_from_counts = True
-            elif sprint_start_date.date() <= leave_dt <= sprint_end_date.date():
-                days_left = (leave_dt - sprint_start_date.date()).days + 1
-                actual_available = sum(
-                    1 for i in range(days_left)
-                    if (sprint_start_date.date() + timedelta(i)).weekday() < 5
-                )
-                actual_available = max(0, actual_available - len(holidays) - l1_days - social_penalty)
-                available = actual_available
-                name_display = name_str
-                days_display = f"{available}"
+            elif leave_dt <= sprint_end_day:
+                days_left = (leave_dt - sprint_start_day).days + 1
+                worked = count_weekdays(sprint_start_day, days_left)
+                actual_available = max(0, worked - holidays_n - l1_days - social_penalty)
                 leavers_this_sprint.append((name_str, leave_date))
-            else:
-                actual_available = available = max(0, days_in_sprint - len(holidays) - l1_days - social_penalty)
-                name_display = name_str
-                days_display = f"{available}"
-        # Handle starters/ramp-up
-        ramping = False
-        ramp_multiplier = 1.0
-        if start_date and (not leave_dt or leave_dt > sprint_end_date.date()):
-            start_dt = datetime.strptime(start_date, date_format).date()
-            if sprint_end_date.date() < start_dt:
-                actual_available = available = 0
-                name_display = name_str
-                days_display = "0"
+        # Starters only count while they are not leaving within or before this sprint
+        if start_date and (not leave_dt or leave_dt > sprint_end_day):
+            start_dt = start_date
+            if sprint_start_day < start_dt:
+                actual_available = 0
                 exclude_from_counts = True
             else:
-                if sprint_start_date.date() < start_dt:
-                    actual_available = available = 0
-                    name_display = name_str
-                    days_display = "0"
-                    exclude_from_counts = True
-                else:
-                    days_since_start = (sprint_start_date.date() - start_dt).days
-                    sprint_num = max(0, days_since_start // 14)
-                    ramp_multiplier = min(base_pct + 0.1 * sprint_num, 1.0)
-                    if sprint_start_date.date() <= start_dt <= sprint_end_date.date():
-                        days_left = (sprint_end_date.date() - start_dt).days + 1
-                        actual_available = sum(
-                            1 for i in range(days_left)
-                            if (start_dt + timedelta(i)).weekday() < 5
-                        )
-                        actual_available = max(0, actual_available - len(holidays) - l1_days - social_penalty)
-                        starters_this_sprint.append((name_str, start_date))
-                    else:
-                        actual_available = max(0, days_in_sprint - len(holidays) - l1_days - social_penalty)
-                    if ramp_multiplier < 1.0:
-                        ramping = True
-                        effective_available = int(round(actual_available * ramp_multiplier))
-                        name_display = f"{name_str} *"
-                        days_display = f"{actual_available} ({effective_available})"
-                        ramping_this_sprint.append((name_str, int(ramp_multiplier * 100)))
-                        available = effective_available
-                    else:
-                        name_display = name_str
-                        days_display = f"{actual_available}"
-                        available = actual_available
-        # Ensure name_display and days_display are always set
-        if name_display == "":
+                days_since_start = (sprint_start_day - start_dt).days
+                sprint_num = max(0, days_since_start // 14)
+                ramp_multiplier = min(base_pct + 0.1 * sprint_num, 1.0)
+                if start_dt == sprint_start_day:
+                    days_left = (sprint_end_day - start_dt).days + 1
+                    worked = count_weekdays(start_dt, days_left)
+                    actual_available = max(0, worked - holidays_n - l1_days - social_penalty)
+                    starters_this_sprint.append((name_str, start_date))
+        if ramp_multiplier < 1.0:
+            available = int(round(actual_available * ramp_multiplier))
+            name_display = f"{name_str} *"
+            days_display = f"{actual_available} ({available})"
+            ramping_this_sprint.append((name_str, int(ramp_multiplier * 100)))
+        else:
+            available = actual_available
             name_display = name_str
-        if days_display == "":
-            days_display = f"{available}"
-        holidays_count = 0 if exclude_from_counts else len(holidays)
-        l1_days_count = 0 if exclude_from_counts else l1_days
-        l2_days_count = 0 if exclude_from_counts else l2_days
+            days_display = str(available)
         if not exclude_from_counts:
-            rows.append([name_display, days_display, holidays_count, l1_days_count, l2_days_count])
+            rows.append([name_display, days_display, holidays_n, l1_days, l2_days])
             total_team_days += available
-            total_team_holidays += len(holidays)
+            total_team_holidays += holidays_n
 
-    sprint_epic_total = _sprint_fte_cache.get(team.jira_key, {}).get(sprint_end_date.strftime(date_format), {}).get("total", 0)
+    sprint_epic_total = _sprint_fte_cache.get(team.jira_key, {}).get(sprint_end_day.isoformat(), {}).get("total", 0)
     points = total_team_days * team.load_factor * team.point_capacity
     eng_points = points * team.engineering_split
     prod_points = points - eng_points
@@ -352,11 +694,31 @@ def get_sprint_data(team):
     Returns:
         Dictionary containing team info, employee IDs, and list of sprint data
     """
-    next_sprint = sprint_start(datetime.now()) - timedelta(days=14 * number_of_sprints_back)
-    tree = fetch_employee_directory_tree()
-    print(tree)
-    core_employee_ids, core_display_names, poi_employee_ids, poi_display_names = get_employee_id_list_from_tree(tree, team)
-    get_future_sprint_fte()
+    # Sprint start dates come from config; work in midnight datetimes here
+    sprint_number_to_date = sprint_window()
+    sprint_starts = {n: datetime.combine(d, datetime.min.time()) for n, d in sprint_number_to_date.items()}
+    next_sprint = sprint_starts[min(sprint_starts)]
+    end_date = sprint_starts[max(sprint_starts)]
+    # The API calls are independent network round trips, so they run concurrently:
+    # the directory, FTE and PagerDuty user lookups first, then the holiday and
+    # on-call fetches that need their IDs
+    pd_names = team.pagerduty_names
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        directory_future = executor.submit(fetch_employee_directory_tree)
+        fte_future = executor.submit(get_future_sprint_fte)
+        pagerduty_ids_future = executor.submit(get_pagerduty_user_ids, pd_names)
+        directory = directory_future.result()
+        core_employee_ids, core_display_names, poi_employee_ids, poi_display_names = get_employee_id_list_from_tree(directory, team)
+        core_days_future = executor.submit(fetch_bamboohr_holidays, next_sprint, end_date, core_employee_ids)
+        poi_days_future = executor.submit(fetch_bamboohr_holidays, next_sprint, end_date, poi_employee_ids)
+        pagerduty_id_list = pagerduty_ids_future.result()
+        l1_future = executor.submit(fetch_pagerduty_oncall, level_one_support_id, next_sprint, end_date, pagerduty_id_list)
+        l2_future = executor.submit(fetch_pagerduty_oncall, level_two_support_id, next_sprint, end_date, pagerduty_id_list)
+        fte_future.result()
+        all_employee_days = core_days_future.result()
+        all_poi_days = poi_days_future.result()
+        l1_all = l1_future.result()
+        l2_all = l2_future.result()
     # Build mapping from bamboo_name to display name for team members
     member_bamboo_to_display = {}
     for member in team.team_members:
@@ -365,71 +727,60 @@ def get_sprint_data(team):
     poi_bamboo_to_display = {}
     for bamboo_name, display_name in zip(team.poi_bamboo_names, team.people_of_interest):
         poi_bamboo_to_display[bamboo_name] = display_name
-    pd_names = [getattr(m, "pagerduty_name", m.name) for m in team.team_members]
-    pagerduty_id_list = get_pagerduty_user_ids(pd_names)
-    end_date = next_sprint + timedelta(days=(number_of_sprints*14))
-    start = next_sprint.strftime(date_format)
-    end = end_date.strftime(date_format)
-    current_start = next_sprint
-    all_employee_days = fetch_bamboohr_holidays(next_sprint, end_date, core_employee_ids)
-    all_poi_days = fetch_bamboohr_holidays(next_sprint, end_date, poi_employee_ids)
-    l1_all = fetch_pagerduty_oncall(level_one_support_id, next_sprint, end_date, pagerduty_id_list)
-    l2_all = fetch_pagerduty_oncall(level_two_support_id, next_sprint, end_date, pagerduty_id_list)
+    # Every sprint's edges are computed once up front (the sprint numbers already are,
+    # by config.sprint_window), leaving no date arithmetic or formatting in the loop below
+    sprint_windows = [(current_start, current_start + timedelta(13)) for current_start in sprint_starts.values()]
+    starts64 = np.array(list(sprint_number_to_date.values()), dtype='datetime64[D]')
+    ends64 = starts64 + np.timedelta64(13, 'D')
+    start_strs = np.datetime_as_string(starts64, unit='D').tolist()
+    end_strs = np.datetime_as_string(ends64, unit='D').tolist()
+    # Assign every absence to the sprints it overlaps in one pass
+    employee_days_by_sprint = bucket_absences_by_sprint(all_employee_days, sprint_windows)
+    poi_days_by_sprint = bucket_absences_by_sprint(all_poi_days, sprint_windows)
+    l1_by_sprint = bucket_dates_by_sprint(l1_all, sprint_windows)
+    l2_by_sprint = bucket_dates_by_sprint(l2_all, sprint_windows)
     sprints = []
-    while current_start <= end_date:
-        sprint_number = get_sprint_number(current_start)
-        current_end = current_start + timedelta(13)
-        socials_in_sprint = [d for d in social_dates if current_start.strftime(date_format) <= d <= current_end.strftime(date_format)]
+    for sprint_idx, sprint_number in enumerate(sprint_starts):
+        current_start, current_end = sprint_windows[sprint_idx]
+        socials_in_sprint = socials_between(current_start.date(), current_end.date())
         social_this_sprint = socials_in_sprint[0] if socials_in_sprint else None
-        # Filter absences for this sprint window
-        employee_days = filter_absences_by_sprint(all_employee_days, current_start, current_end)
-        poi_days = filter_absences_by_sprint(all_poi_days, current_start, current_end)
+        # Absences for this sprint window
+        employee_days = employee_days_by_sprint[sprint_idx]
+        poi_days = poi_days_by_sprint[sprint_idx]
         holidays_dict = {}
         holiday_rows = []
+        sprint_lo = starts64[sprint_idx]
+        sprint_hi = ends64[sprint_idx]
         for emp in employee_days:
-            bamboo_name = str(emp)
+            bamboo_name = emp[1]
             display_name = member_bamboo_to_display.get(bamboo_name, bamboo_name)
             holidays_dict[bamboo_name] = set()
             for absence in employee_days[emp]:
-                start_hol = datetime.strptime(str(absence[0]), date_format).date()
-                end_hol = datetime.strptime(str(absence[1]), date_format).date()
-                for n in range((end_hol - start_hol).days + 1):
-                    hol_date = start_hol + timedelta(days=n)
-                    if hol_date.weekday() < 5 and current_start.date() <= hol_date <= current_end.date():
-                        holidays_dict[bamboo_name].add(hol_date)
+                # The absence's weekdays within the sprint, clipped before expanding
+                first = max(np.datetime64(str(absence[0]), 'D'), sprint_lo)
+                last = min(np.datetime64(str(absence[1]), 'D'), sprint_hi)
+                hol_dates = np.arange(first, last + np.timedelta64(1, 'D'), dtype='datetime64[D]')
+                holidays_dict[bamboo_name].update(hol_dates[np.is_busday(hol_dates)].tolist())
             total_days = sum(absence[3] for absence in employee_days[emp])
             holiday_rows.append([display_name, total_days, str(employee_days[emp])])
         # Manager/POI holidays for this sprint
         poi_holiday_rows = []
         for emp in poi_days:
-            bamboo_name = str(emp)
+            bamboo_name = emp[1]
             display_name = poi_bamboo_to_display.get(bamboo_name, bamboo_name)
             absences = poi_days[emp]
             if absences:
                 total_days = sum(a[3] for a in absences)
                 poi_holiday_rows.append([display_name, total_days, str(absences)])
         # On-call
-        # Ensure date range comparison is inclusive and robust
-        sprint_start_str = current_start.strftime(date_format)
-        sprint_end_str = current_end.strftime(date_format)
-        def in_sprint(d):
-            return sprint_start_str <= d <= sprint_end_str
-        l1 = {}
-        for name, dates in l1_all.items():
-            filtered_dates = [d for d in dates if in_sprint(d)]
-            if filtered_dates:
-                l1[name] = filtered_dates
-        l2 = {}
-        for name, dates in l2_all.items():
-            filtered_dates = [d for d in dates if in_sprint(d)]
-            if filtered_dates:
-                l2[name] = filtered_dates
+        l1 = l1_by_sprint[sprint_idx]
+        l2 = l2_by_sprint[sprint_idx]
         # Team availability
         team_avail = get_team_availability(current_start, current_end, l1, l2, holidays_dict, team)
         sprints.append({
             "sprint_number": sprint_number,
-            "start": current_start.strftime(date_format),
-            "end": current_end.strftime(date_format),
+            "start": start_strs[sprint_idx],
+            "end": end_strs[sprint_idx],
             "social": social_this_sprint,
             "holidays": holiday_rows,
             "poi_manager_holidays": poi_holiday_rows,
@@ -437,7 +788,6 @@ def get_sprint_data(team):
             "l2": l2,
             "team_availability": team_avail,
         })
-        current_start = current_start + timedelta(14)
     return {
         "team": team,
         "core_display_names": core_display_names,
@@ -466,8 +816,8 @@ def get_pagerduty_user_ids(team):
         # however, the returned data is not returning the total to be able to paginate properly
         # this code therefore defaults to 1000 users to future-proof
         params = {"limit":1000}
-        response = requests.get(url, params=params, headers={'Authorization': 'Token token=%s' %  pagerduty_api_key})
-        tree = json.loads(response.text)
+        response = _api_session("pagerduty").get(url, params=params, timeout=_API_REQUEST_TIMEOUT)
+        tree = _json_loads(response.text)
         _pagerduty_users_cache = {user["name"]: user["id"] for user in tree["users"]}
     # Use dict lookup for efficiency
     return [user_id for name, user_id in _pagerduty_users_cache.items() if name in team]
@@ -483,62 +833,83 @@ def fetch_pagerduty_oncall(schedule, start, end, employee_id_list):
         employee_id_list: List of PagerDuty user IDs to filter by
         
     Returns:
-        Dictionary mapping user names to lists of on-call dates
+        Dictionary mapping user names to lists of distinct on-call dates
     """
     def fetch():
         url = f'https://api.pagerduty.com/schedules/{schedule}'
         params = {"since":start + timedelta(-1),"until":end,"overflow":"true"}
-        headers = {
-            "Accept": "application/json",
-            "Content-Type": "application/json",
-            "Authorization": f"Token token={pagerduty_api_key}"
-        }
-        response = requests.get(url, params=params, headers=headers)
+        response = _api_session("pagerduty").get(
+            url, params=params, headers={"Content-Type": "application/json"}, timeout=_API_REQUEST_TIMEOUT
+        )
         return response.text
     cache_key = f"pagerduty_oncall_{schedule}_{start.strftime('%Y%m%d')}_{end.strftime('%Y%m%d')}"
     raw_json = cache_api_response(cache_key, fetch, api_cache_timeout)
-    tree = json.loads(raw_json)
-    schedule = {}
+    tree = _json_loads(raw_json)
+    wanted_ids = frozenset(employee_id_list)
+    output = {}
     for entry in tree["schedule"]["final_schedule"]["rendered_schedule_entries"]:
-        user_id = entry["user"]["id"]
-        if user_id in employee_id_list:
-            if user_id not in schedule:
-                schedule[user_id] = []
-            schedule[user_id].append([user_id, entry["user"]["summary"], entry["start"], entry["end"]])
-    if not schedule:
-        return {}
-    else:
-        output = {}
-        for user_id, entries in schedule.items():
-            for entry in entries:
-                if entry[1] not in output:
-                    output[entry[1]] = []
-                output[entry[1]].append(entry[2][0:10])
-        return output
+        user = entry["user"]
+        if user["id"] in wanted_ids:
+            dates = output.setdefault(user["summary"], [])
+            day = entry["start"][0:10]
+            # Entries are chronological, so split shifts on one day arrive back to back
+            if not dates or dates[-1] != day:
+                dates.append(day)
+    return output
 
 
-def filter_absences_by_sprint(absence_dict, sprint_start, sprint_end):
-    """Filter absence data to only include absences overlapping the sprint.
+def bucket_absences_by_sprint(absence_dict, sprint_windows):
+    """Split absence data into the sprints each absence overlaps.
     
     Args:
         absence_dict: Dictionary mapping employees to absence periods
-        sprint_start: Start date of the sprint
-        sprint_end: End date of the sprint
+        sprint_windows: Sorted, non-overlapping list of (sprint_start, sprint_end) datetimes
         
     Returns:
-        Filtered dictionary with only relevant absences
+        List with one dictionary per sprint window, mapping employees to the
+        absences overlapping that sprint
     """
-    filtered = {}
-    for emp, absences in absence_dict.items():
-        filtered_absences = []
-        for absence in absences:
-            absence_start = datetime.strptime(str(absence[0]), date_format).date()
-            absence_end = datetime.strptime(str(absence[1]), date_format).date()
-            if absence_end >= sprint_start.date() and absence_start <= sprint_end.date():
-                filtered_absences.append(absence)
-        if filtered_absences:
-            filtered[emp] = filtered_absences
-    return filtered
+    buckets = [{} for _ in sprint_windows]
+    flat = [(emp, absence) for emp, absences in absence_dict.items() for absence in absences]
+    if not flat or not sprint_windows:
+        return buckets
+    # Parse every absence's bounds once, then binary-search them into the windows:
+    # an absence overlaps from the first window ending on or after its start to
+    # the last window starting on or before its end
+    starts = np.array([str(absence[0]) for _, absence in flat], dtype='datetime64[D]')
+    ends = np.array([str(absence[1]) for _, absence in flat], dtype='datetime64[D]')
+    window_starts = np.array([w[0].date() for w in sprint_windows], dtype='datetime64[D]')
+    window_ends = np.array([w[1].date() for w in sprint_windows], dtype='datetime64[D]')
+    firsts = np.searchsorted(window_ends, starts, side='left')
+    lasts = np.searchsorted(window_starts, ends, side='right')
+    for (emp, absence), first, last in zip(flat, firsts.tolist(), lasts.tolist()):
+        for sprint_idx in range(first, last):
+            buckets[sprint_idx].setdefault(emp, []).append(absence)
+    return buckets
+
+
+def bucket_dates_by_sprint(dates_by_name, sprint_windows):
+    """Split each name's on-call dates into the sprints they fall in.
+    
+    Args:
+        dates_by_name: Dictionary mapping names to lists of ISO date strings
+        sprint_windows: Sorted, non-overlapping list of (sprint_start, sprint_end) datetimes
+        
+    Returns:
+        List with one dictionary per sprint window, mapping names to their dates in
+        that sprint (in their original order); names without dates are omitted
+    """
+    # ISO date strings sort chronologically, so each date is binary-searched
+    # straight into the window starting on or before it
+    window_starts = [w[0].date().isoformat() for w in sprint_windows]
+    window_ends = [w[1].date().isoformat() for w in sprint_windows]
+    buckets = [{} for _ in sprint_windows]
+    for name, dates in dates_by_name.items():
+        for d in dates:
+            sprint_idx = bisect_right(window_starts, d) - 1
+            if sprint_idx >= 0 and d <= window_ends[sprint_idx]:
+                buckets[sprint_idx].setdefault(name, []).append(d)
+    return buckets
 
 
 # Data builder for xmas rota CSV
@@ -551,28 +922,23 @@ def build_xmas_rota_data():
     Returns:
         Tuple of (date_list, user_absence_map) for rendering the rota
     """
-    start_date = datetime.strptime(xmas_rota_dates[0], "%Y-%m-%d").date()
-    end_date = datetime.strptime(xmas_rota_dates[1], "%Y-%m-%d").date()
-    tree = fetch_employee_directory_tree()
+    start_date, end_date = xmas_rota_dates
+    directory = fetch_employee_directory_tree()
     # Build mapping from employee id to display name
     all_employee_ids = []
     id_to_name = {}
-    for employee in tree.employees.employee:
-        employee_id = employee.attrib["id"]
-        division_el = employee.find(".//field[@id='division']")
-        division_val = division_el.text.strip() if division_el is not None and division_el.text else ""
+    for employee in directory:
+        employee_id = employee["id"]
+        division_val = (employee.get("division") or "").strip()
         if division_val.lower() != "tech":
             continue
         # Name resolution precedence: preferredName + lastName -> displayName -> employee_id
-        preferred_el = employee.find(".//field[@id='preferredName']")
-        last_el = employee.find(".//field[@id='lastName']")
-        display_el = employee.find(".//field[@id='displayName']")
-        preferred = preferred_el.text.strip() if preferred_el is not None and preferred_el.text else None
-        last_name = last_el.text.strip() if last_el is not None and last_el.text else None
+        preferred = (employee.get("preferredName") or "").strip() or None
+        last_name = (employee.get("lastName") or "").strip() or None
         if preferred and last_name:
             resolved_name = f"{preferred} {last_name}".strip()
         else:
-            resolved_name = display_el.text.strip() if display_el is not None and display_el.text else employee_id
+            resolved_name = (employee.get("displayName") or "").strip() or employee_id
         all_employee_ids.append(employee_id)
         id_to_name[employee_id] = resolved_name
     all_employee_days = fetch_bamboohr_holidays(start_date, end_date, all_employee_ids)
@@ -581,100 +947,76 @@ def build_xmas_rota_data():
     while d <= end_date:
         date_list.append(d)
         d += timedelta(days=1)
-    # Prepare exclusions (case-insensitive)
+    # Prepare exclusions (case-insensitive); resolved names are already stripped
     exclusions = {e.strip().lower() for e in xmas_rota_exclusions}
+    included_names = {name for name in id_to_name.values() if name.lower() not in exclusions}
     user_absence_map = {}
     # First collect absences for those who have them
-    for emp_obj, absences in all_employee_days.items():
-        employee_id = emp_obj.attrib.get("id")
-        display_name = id_to_name.get(employee_id, employee_id)
-        name_key = display_name.strip()
+    for (employee_id, _), absences in all_employee_days.items():
+        name_key = id_to_name.get(employee_id) or employee_id.strip()
         if name_key.lower() in exclusions:
             continue
         absence_dates = set()
+        # Expand each absence into its days in C; tolist() yields date objects
         for absence in absences:
-            start = datetime.strptime(str(absence[0]), "%Y-%m-%d").date()
-            end = datetime.strptime(str(absence[1]), "%Y-%m-%d").date()
-            for n in range((end - start).days + 1):
-                absence_dates.add(start + timedelta(days=n))
+            start = np.datetime64(str(absence[0]), 'D')
+            end = np.datetime64(str(absence[1]), 'D')
+            absence_dates.update(np.arange(start, end + np.timedelta64(1, 'D'), dtype='datetime64[D]').tolist())
         user_absence_map[name_key] = absence_dates
     # Ensure all non-excluded employees appear, even with no absences
-    for employee_id, display_name in id_to_name.items():
-        name_key = display_name.strip()
-        if name_key.lower() in exclusions:
-            continue
-        if name_key not in user_absence_map:
-            user_absence_map[name_key] = set()
+    for name_key in included_names - user_absence_map.keys():
+        user_absence_map[name_key] = set()
     return date_list, user_absence_map
 
 
-def debug_dump(team, data):
-        print("==== RAW EMPLOYEE DIRECTORY API RESPONSE ====")
-        # Dump raw employee directory XML
-        cache_dir = "./.api_cache"
-        directory_cache_file = os.path.join(cache_dir, "bamboohr_directory.pkl")
-        if os.path.exists(directory_cache_file):
-            with open(directory_cache_file, "rb") as f:
-                cached = pickle.load(f)
-                raw_xml = cached["data"] if isinstance(cached["data"], str) else str(cached["data"])
-                print(raw_xml)
-        else:
-            print("No cached employee directory found.")
-
-        print("\n==== RAW EMPLOYEE HOLIDAYS API RESPONSE ====")
-        # Dump raw holidays XML for core and POI employees
-        # Use the same cache key logic as fetch_bamboohr_holidays
-        next_sprint = sprint_start(datetime.now()) - timedelta(days=14 * number_of_sprints_back)
-        end_date = next_sprint + timedelta(days=(number_of_sprints*14))
-        start_str = next_sprint.strftime(date_format)
-        end_str = end_date.strftime(date_format)
-        core_employee_ids, _, poi_employee_ids, _ = get_employee_id_list_from_tree(fetch_employee_directory_tree(), team)
-        core_cache_key = f"bamboohr_holidays_{next_sprint.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}"
-        poi_cache_key = f"bamboohr_holidays_{next_sprint.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}"
-        core_cache_file = os.path.join(cache_dir, f"{core_cache_key}.pkl")
-        poi_cache_file = os.path.join(cache_dir, f"{poi_cache_key}.pkl")
-        if os.path.exists(core_cache_file):
-            with open(core_cache_file, "rb") as f:
-                cached = pickle.load(f)
-                raw_xml = cached["data"] if isinstance(cached["data"], str) else str(cached["data"])
-                print("-- Core Employee Holidays --")
-                print(raw_xml)
-        else:
-            print("No cached core employee holidays found.")
-        if os.path.exists(poi_cache_file):
-            with open(poi_cache_file, "rb") as f:
-                cached = pickle.load(f)
-                raw_xml = cached["data"] if isinstance(cached["data"], str) else str(cached["data"])
-                print("-- POI Employee Holidays --")
-                print(raw_xml)
-        else:
-            print("No cached POI employee holidays found.")
-
-        print("\n==== RAW PAGERDUTY SHIFTS API RESPONSE ====")
-        # Dump raw PagerDuty shift JSON for L1 and L2
-        pd_names = [getattr(m, "pagerduty_name", m.name) for m in team.team_members]
-        pagerduty_id_list = get_pagerduty_user_ids(pd_names)
-        l1_cache_key = f"pagerduty_oncall_{level_one_support_id}_{next_sprint.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}"
-        l2_cache_key = f"pagerduty_oncall_{level_two_support_id}_{next_sprint.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}"
-        l1_cache_file = os.path.join(cache_dir, f"{l1_cache_key}.pkl")
-        l2_cache_file = os.path.join(cache_dir, f"{l2_cache_key}.pkl")
-        if os.path.exists(l1_cache_file):
-            with open(l1_cache_file, "rb") as f:
-                cached = pickle.load(f)
-                raw_json = cached["data"] if isinstance(cached["data"], str) else str(cached["data"])
-                print("-- L1 PagerDuty Shifts --")
-                print(raw_json)
-        else:
-            print("No cached L1 PagerDuty shifts found.")
-        if os.path.exists(l2_cache_file):
-            with open(l2_cache_file, "rb") as f:
-                cached = pickle.load(f)
-                raw_json = cached["data"] if isinstance(cached["data"], str) else str(cached["data"])
-                print("-- L2 PagerDuty Shifts --")
-                print(raw_json)
-        else:
-            print("No cached L2 PagerDuty shifts found.")
+def _load_cached_payload(cache_key):
+    """Read the raw payload of an API cache entry for debugging.
+    
+    Args:
+        cache_key: Unique identifier for the cached data
+        
+    Returns:
+        The cached payload as a string, or None if nothing is cached for the key
+    """
+    entry = _read_api_cache_entry(cache_key)
+    if entry is None:
         return None
+    data = entry["data"]
+    return data if isinstance(data, str) else str(data)
+
+
+def debug_dump(team, data):
+    # Use the same cache key logic as the fetch functions
+    sprint_dates = list(sprint_window().values())
+    next_sprint, end_date = sprint_dates[0], sprint_dates[-1]
+    # Core and POI holidays come from the same quarter-aligned whos_out response
+    holidays_cache_key = _bamboohr_holidays_fetch_range(next_sprint, end_date)[2]
+    date_range = f"{next_sprint:%Y%m%d}_{end_date:%Y%m%d}"
+    l1_cache_key = f"pagerduty_oncall_{level_one_support_id}_{date_range}"
+    l2_cache_key = f"pagerduty_oncall_{level_two_support_id}_{date_range}"
+    # (section header, label, cache key, message when missing), in print order
+    sections = [
+        ("==== RAW EMPLOYEE DIRECTORY API RESPONSE ====", None, "bamboohr_directory_records",
+         "No cached employee directory found."),
+        ("\n==== RAW EMPLOYEE HOLIDAYS API RESPONSE ====", "-- Core and POI Employee Holidays --", holidays_cache_key,
+         "No cached employee holidays found."),
+        ("\n==== RAW PAGERDUTY SHIFTS API RESPONSE ====", "-- L1 PagerDuty Shifts --", l1_cache_key,
+         "No cached L1 PagerDuty shifts found."),
+        (None, "-- L2 PagerDuty Shifts --", l2_cache_key, "No cached L2 PagerDuty shifts found."),
+    ]
+    # Read the cache files concurrently, then print them in order
+    with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+        payloads = list(executor.map(_load_cached_payload, [key for _, _, key, _ in sections]))
+    for (header, label, _, missing), payload in zip(sections, payloads):
+        if header:
+            print(header)
+        if payload is None:
+            print(missing)
+            continue
+        if label:
+            print(label)
+        print(payload)
+    return None
 
 
 if __name__ == "__main__":
@@ -687,6 +1029,7 @@ if __name__ == "__main__":
     parser.add_argument("-interest", "-i", action="store_true", help="Show upcoming holidays for people of interest and the manager")
     parser.add_argument("-full", "-f", action="store_true", help="Show full output")
     parser.add_argument("-purge", "-p", action="store_true", help="Delete all cached API data before running")
+    parser.add_argument("-refresh", "-r", action="store_true", help="Refetch all API data instead of using the cache")
     parser.add_argument("-slack", "-s", action="store_true", help="Send data to Slack")
     parser.add_argument("-xmas", "-x", action="store_true", help="Show Christmas rota CSV output")
     parser.add_argument("-bankhols", "-b", action="store_true", help="Show next 12 months bank holidays")
@@ -699,45 +1042,61 @@ if __name__ == "__main__":
     if args.purge:
         cache_dir = "./.api_cache"
         if os.path.exists(cache_dir):
-            for fname in os.listdir(cache_dir):
-                fpath = os.path.join(cache_dir, fname)
-                try:
-                    os.remove(fpath)
-                except Exception as e:
-                    print(f"Failed to delete {fpath}: {e}")
+            # scandir yields the entries' paths from a single directory read
+            with os.scandir(cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        os.unlink(entry.path)
+                    except OSError as e:
+                        print(f"Failed to delete {entry.path}: {e}")
             print("API cache purged.")
         else:
             print("No API cache directory found.")
         sys.exit(1)
+    if args.refresh:
+        invalidate_api_cache()
 
     team_name = args.team_name.lower()
-    team = next((t for t in teams if t.name.lower() == team_name), None)
+    team = config.teams_by_name.get(team_name)
     if not team:
-        print(f"Team '{team_name}' not found. Available teams: {[t.name for t in teams]}")
+        print(f"Team '{team_name}' not found. Available teams: {[t.name for t in config.teams]}")
         sys.exit(1)
-    data = get_sprint_data(team)
-    action = False
+    # Each flag maps to (needs_data, render); the sprint data is only fetched when a
+    # selected flag needs it, so e.g. -bankhols and -xmas make no sprint API calls
     output_map = {
-        'capacity': lambda: SprintPresentation.render_capacity_table(data),
-        'absences': lambda: SprintPresentation.render_holidays(data, team),
-        'l1': lambda: SprintPresentation.render_l1_assignments(data),
-        'l2': lambda: SprintPresentation.render_l2_assignments(data),
-        'interest': lambda: SprintPresentation.render_manager_and_poi_holidays(data, team),
-        'slack': lambda: Slack.send_sprint_data_to_slack(data, team),
-        'full': lambda: SprintPresentation.render_sprint_data(data),
-        'xmas': lambda: SprintPresentation.render_xmas_rota_csv(*build_xmas_rota_data()),
-        'bankhols': lambda: SprintPresentation.render_next_12_months_bank_holidays(),
-        'warning': lambda: SprintPresentation.render_l1_l2_absence_warnings(data),
-        'debug': lambda: debug_dump(data, team),
-        'calendar': lambda: SprintPresentation.render_calendar_view(data, team),
+        'capacity': (True, lambda data: SprintPresentation.render_capacity_table(data)),
+        'absences': (True, lambda data: SprintPresentation.render_holidays(data, team)),
+        'l1': (True, lambda data: SprintPresentation.render_l1_assignments(data)),
+        'l2': (True, lambda data: SprintPresentation.render_l2_assignments(data)),
+        'interest': (True, lambda data: SprintPresentation.render_manager_and_poi_holidays(data, team)),
+        'slack': (True, lambda data: Slack.send_sprint_data_to_slack(data, team)),
+        'full': (True, lambda data: SprintPresentation.render_sprint_data(data)),
+        'xmas': (False, lambda data: SprintPresentation.render_xmas_rota_csv(*build_xmas_rota_data())),
+        'bankhols': (False, lambda data: SprintPresentation.render_next_12_months_bank_holidays()),
+        'warning': (True, lambda data: SprintPresentation.render_l1_l2_absence_warnings(data)),
+        # The debug dump reads the API cache entries that fetching the sprint data writes
+        'debug': (True, lambda data: debug_dump(team, data)),
+        'calendar': (True, lambda data: SprintPresentation.render_calendar_view(data, team)),
     }
 
-    for arg, func in output_map.items():
-        if getattr(args, arg, False):
-            result = func()
-            if result is not None:
-                print(result)
-            action = True
-    if not action:
+    # Only the flags actually set are dispatched, in output_map order
+    set_flags = {arg for arg, value in vars(args).items() if value is True}
+    selected = [arg for arg in output_map if arg in set_flags]
+    if not selected:
         print("No output option specified")
         parser.print_help()
+    data = get_sprint_data(team) if any(output_map[arg][0] for arg in selected) else None
+    # With several flags the renderers run concurrently and their results are
+    # printed in flag order. Slack sends and the debug dump (which prints as it
+    # goes) run inline, in their turn. The renderers' only write to data is the
+    # shared absence index, so it is built here first; after that no thread
+    # changes data while another (e.g. the Slack digest) iterates it.
+    inline = {'slack', 'debug'} if len(selected) > 1 else set(selected)
+    if data is not None and len(selected) > 1:
+        SprintPresentation.build_absence_indexes(data)
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(selected)))) as executor:
+        futures = {arg: executor.submit(output_map[arg][1], data) for arg in selected if arg not in inline}
+        for arg in selected:
+            result = futures[arg].result() if arg in futures else output_map[arg][1](data)
+            if result is not None:
+                print(result)
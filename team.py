@@ -1,6 +1,9 @@
+from dataclasses import dataclass, field
+
 from teammember import TeamMember
 
 
+@dataclass(slots=True, frozen=True)
 class Team:
     """Represents a team with configuration for sprint planning.
     
@@ -9,9 +12,11 @@ class Team:
         jira_key: JIRA project key for the team
         points_per_epic: Story points per epic
         manager: Manager name
-        team_members: List of TeamMember objects
-        people_of_interest: List of POI display names (for tracking absences)
-        poi_bamboo_names: List of POI names as they appear in BambooHR
+        team_members: Tuple of TeamMember objects
+        bamboo_names: Tuple of the members' BambooHR names, in team_members order
+        pagerduty_names: Tuple of the members' PagerDuty names, in team_members order
+        people_of_interest: Tuple of POI display names (for tracking absences)
+        poi_bamboo_names: Tuple of POI names as they appear in BambooHR
         point_capacity: Point capacity per person per day
         load_factor: Load factor for capacity calculations
         engineering_split: Proportion of capacity for engineering work
@@ -20,45 +25,39 @@ class Team:
         support_canvas: Slack canvas ID for support assignments
     """
     
-    def __init__(
-        self,
-        name,
-        jira_key,
-        points_per_epic,
-        manager,
-        team_members,
-        people_of_interest,
-        point_capacity,
-        load_factor,
-        engineering_split,
-        absences_canvas=None,
-        capacity_canvas=None,
-        support_canvas=None
-    ):
-        self.name = name
-        self.jira_key = jira_key
-        self.points_per_epic = points_per_epic
-        self.manager = manager
-        # Accept a list of dicts and instantiate TeamMember objects
-        self.team_members = [TeamMember.from_dict(m) if not isinstance(m, TeamMember) else m for m in team_members]
-        # Process people_of_interest - all entries should be dicts with name and optional bamboo_name
-        self.people_of_interest = []
-        self.poi_bamboo_names = []
-        for poi in people_of_interest:
-            if isinstance(poi, dict):
-                self.people_of_interest.append(poi['name'])
-                self.poi_bamboo_names.append(poi.get('bamboo_name', poi['name']))
-            else:
-                # Legacy support for plain strings (though YAML should now always be dicts)
-                self.people_of_interest.append(poi)
-                self.poi_bamboo_names.append(poi)
-        self.point_capacity = point_capacity
-        self.load_factor = load_factor
-        self.engineering_split = engineering_split
-        self.absences_canvas = absences_canvas
-        self.capacity_canvas = capacity_canvas
-        self.support_canvas = support_canvas
+    name: str
+    jira_key: str
+    points_per_epic: float
+    manager: str
+    point_capacity: float
+    load_factor: float
+    engineering_split: float
+    team_members: tuple = ()
+    people_of_interest: tuple = ()
+    absences_canvas: str | None = None
+    capacity_canvas: str | None = None
+    support_canvas: str | None = None
+    poi_bamboo_names: tuple = field(init=False)
+    bamboo_names: tuple = field(init=False)
+    pagerduty_names: tuple = field(init=False)
 
+    def __post_init__(self):
+        # The dataclass is frozen, so normalised fields are set via object.__setattr__
+        # Accept a list of dicts and instantiate TeamMember objects
+        object.__setattr__(self, "team_members", tuple(
+            TeamMember.from_dict(m) if not isinstance(m, TeamMember) else m for m in self.team_members
+        ))
+        object.__setattr__(self, "bamboo_names", tuple(m.bamboo_name for m in self.team_members))
+        object.__setattr__(self, "pagerduty_names", tuple(m.pagerduty_name for m in self.team_members))
+        # Process people_of_interest - all entries should be dicts with name and optional bamboo_name,
+        # with legacy support for plain strings; split into (name, bamboo_name) pairs in one pass
+        pairs = [
+            (poi['name'], poi.get('bamboo_name', poi['name'])) if isinstance(poi, dict) else (poi, poi)
+            for poi in self.people_of_interest
+        ]
+        people_of_interest, poi_bamboo_names = tuple(zip(*pairs)) if pairs else ((), ())
+        object.__setattr__(self, "people_of_interest", people_of_interest)
+        object.__setattr__(self, "poi_bamboo_names", poi_bamboo_names)
 
     def __repr__(self):
         """String representation of Team."""
@@ -1,3 +1,20 @@
+from datetime import date
+from functools import lru_cache
+import sys
+
+
+def _parse_date(value):
+    """Convert an ISO date string to a date, passing dates and None through.
+    
+    Args:
+        value: ISO date string, date or None
+        
+    Returns:
+        date or None
+    """
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
 class TeamMember:
     """Represents a team member with their configuration.
     
@@ -8,27 +25,61 @@ class TeamMember:
         start_date: Date the member joined (for ramp-up calculations)
         leave_date: Date the member is leaving (if applicable)
         start_pct: Starting capacity percentage (for ramp-up)
+    
+    Instances are immutable: from_dict shares one instance between every team
+    that lists a person with the same settings.
     """
     
+    __slots__ = ("name", "bamboo_name", "pagerduty_name", "start_date", "leave_date", "start_pct")
+
     def __init__(self, name, bamboo_name=None, pagerduty_name=None, start_date=None, leave_date=None, start_pct=1):
-        self.name = name
-        self.bamboo_name = bamboo_name if bamboo_name else name
-        self.pagerduty_name = pagerduty_name if pagerduty_name else name
-        self.start_date = start_date
-        self.leave_date = leave_date
-        self.start_pct = start_pct
+        # Attributes are read-only, so they are set via object.__setattr__
+        # Interned so the same person's names share one string object across teams
+        # and loaders (YAML, JSON sidecar, compiled teams_data)
+        name = sys.intern(name)
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "bamboo_name", sys.intern(bamboo_name) if bamboo_name else name)
+        object.__setattr__(self, "pagerduty_name", sys.intern(pagerduty_name) if pagerduty_name else name)
+        # Dates are parsed once here, so the per-sprint availability maths compares dates
+        object.__setattr__(self, "start_date", _parse_date(start_date))
+        object.__setattr__(self, "leave_date", _parse_date(leave_date))
+        object.__setattr__(self, "start_pct", start_pct)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TeamMember is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TeamMember is immutable; cannot delete {name!r}")
+
+    def __reduce__(self):
+        # Rebuild through __init__ when unpickled, since the slots can't be set directly
+        return (TeamMember, (self.name, self.bamboo_name, self.pagerduty_name,
+                             self.start_date, self.leave_date, self.start_pct))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _make(name, bamboo_name, pagerduty_name, start_date, leave_date, start_pct):
+        """Create a TeamMember, reusing the instance built for identical settings.
+        
+        Returns:
+            Shared TeamMember instance
+        """
+        return TeamMember(name, bamboo_name, pagerduty_name, start_date, leave_date, start_pct)
 
     @staticmethod
     def from_dict(member_dict):
         """Create a TeamMember from a dictionary.
         
+        A person listed with the same settings in several teams gets one shared
+        instance, so each member is only built (and has its dates parsed) once.
+        
         Args:
             member_dict: Dictionary with member configuration
             
         Returns:
             TeamMember instance
         """
-        return TeamMember(
+        return TeamMember._make(
             name=member_dict["name"],
             bamboo_name=member_dict.get("bamboo_name", member_dict["name"]),
             pagerduty_name=member_dict.get("pagerduty_name", member_dict["name"]),
@@ -0,0 +1,69 @@
+"""Compile the team YAML files into an importable teams_data module.
+
+The generated teams_data.py holds a TEAMS tuple of Team(...) expressions, so
+loading teams is just importing a (byte-compiled) module. The YAML files stay
+the source of truth: config.load_teams() ignores teams_data.py once any YAML
+file changes, until this script is run again.
+
+Usage:
+    python3 tools/compile_teams.py
+"""
+import json
+import os
+import pprint
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import config  # noqa: E402
+
+
+def render_teams_module(team_configs, digest):
+    """Render the source of the teams_data module.
+
+    Args:
+        team_configs: List of team config dicts
+        digest: Digest of the YAML files the configs were read from
+
+    Returns:
+        Python source string
+    """
+    lines = [
+        "# Generated by tools/compile_teams.py from teams/*.yaml - do not edit.",
+        "from team import Team",
+        "",
+        f"SOURCE_DIGEST = {digest!r}",
+        "",
+        "TEAMS = (",
+    ]
+    for team_config in team_configs:
+        lines.append("    Team(")
+        for key, value in team_config.items():
+            prefix = f"        {key}="
+            value_lines = pprint.pformat(value, width=88 - len(prefix), sort_dicts=False).splitlines()
+            lines.append(prefix + value_lines[0])
+            lines.extend(" " * len(prefix) + line for line in value_lines[1:])
+            lines[-1] += ","
+        lines.append("    ),")
+    lines.append(")")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    teams_dir, yaml_entries = config._scan_teams_dir()
+    # Round-trip through JSON so unquoted YAML dates are emitted as ISO strings
+    team_configs = json.loads(json.dumps(config._read_yaml_configs(yaml_entries), default=str))
+    # Validate the configs the same way load_teams() does before emitting them
+    config._build_teams([dict(c) for c in team_configs])
+    source = render_teams_module(team_configs, config._teams_digest(yaml_entries))
+    out_file = os.path.join(ROOT_DIR, "teams_data.py")
+    tmp_file = f"{out_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        f.write(source)
+    os.replace(tmp_file, out_file)
+    print(f"Wrote {out_file}")
+
+
+if __name__ == "__main__":
+    main()